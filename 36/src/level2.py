@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import operator
-import os
 from enum import Enum
 from itertools import *
 from typing import List
@@ -65,36 +64,3 @@ def run_level(infile: str, input: List[str], outfile: str) -> str:
     pacman_coords = set(accumulate(map(operator.attrgetter("value"), movement), initial=start))
     #return str(pacman_coords)
     return str(sum(1 for c in pacman_coords if board[c] == "C"))
-
-
-#####################################
-
-def is_input_file(infile: str) -> bool:
-    return infile.endswith('.in')
-
-
-def get_outfile(infile: str) -> str:
-    return infile.split('.in')[0] + '.out'
-
-
-if __name__ == '__main__':
-    level = os.path.basename(__file__).split('.py')[0]
-    print(os.getcwd())
-
-    leveldir = os.path.join(os.path.dirname(__file__), '../levels/' + level + '/')
-    for file in os.listdir(leveldir):
-        infile = leveldir + file
-
-        if not is_input_file(infile):
-            continue
-
-        with open(infile) as f:
-            content = f.readlines()
-
-        outfile = get_outfile(infile)
-        result = run_level(infile, content, outfile)
-
-        if result and len(result) > 0:
-            with open(outfile, 'w') as f:
-                f.write(result)
-                f.write('\n')
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import operator
-import os
 from enum import Enum
 from heapq import heappush, heappop
 from itertools import *
@@ -113,35 +112,3 @@ def run_level(infile: str, input: List[str], outfile: str) -> str:
             coins = coins.difference({pos})
             path += d_str
             q.append((path, pos, ghost_pos, coins))
-
-
-#####################################
-
-
-def is_input_file(infile: str) -> bool:
-    return infile.endswith('.in')
-
-def get_outfile(infile: str) -> str:
-    return infile.split('.in')[0] + '.out'
-
-if __name__ == '__main__':
-    level = os.path.basename(__file__).split('.py')[0]
-    print(os.getcwd())
-
-    leveldir = os.path.join(os.path.dirname(__file__), '../levels/' + level + '/')
-    for file in os.listdir(leveldir):
-        infile = leveldir + file
-
-        if not is_input_file(infile):
-            continue
-
-        with open(infile) as f:
-            content = f.readlines()
-
-        outfile = get_outfile(infile)
-        result = run_level(infile, content, outfile)
-
-        if result and len(result) > 0:
-            with open(outfile, 'w') as f:
-                f.write(result)
-                f.write('\n')
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import operator
-import os
 from itertools import product
 from typing import List
 
@@ -61,37 +60,3 @@ def run_level(infile: str, input: List[str], outfile: str) -> str:
     level = {Vec(x, y): c for y, l in enumerate(input[1:size + 1]) for x, c in enumerate(l)}
     coords = [tuple(Vec(*map(int, a.split(","))) for a in l.split(" ")) for l in input[size + 2:]]
     return "\n".join(" ".join(f"{c[0]},{c[1]}" for c in find_valid_route(level, a, b)) for a, b in coords)
-
-
-#####################################
-
-def is_input_file(infile: str) -> bool:
-    return infile.endswith('.in')
-
-
-def get_outfile(infile: str) -> str:
-    return infile.split('.in')[0] + '.out'
-
-
-if __name__ == '__main__':
-    level = os.path.basename(__file__).split('.py')[0]
-    print(os.getcwd())
-
-    leveldir = os.path.join(os.path.dirname(__file__), '../levels/' + level + '/')
-    for file in os.listdir(leveldir):
-        infile = leveldir + file
-
-        if not is_input_file(infile):
-            continue
-
-        with open(infile) as f:
-            content = f.readlines()
-
-        outfile = get_outfile(infile)
-        result = run_level(infile, content, outfile)
-
-        if result and len(result) > 0:
-            with open(outfile, 'w') as f:
-                f.write(result)
-                f.write('\n')
-        print(f"completed {file}")
\ No newline at end of file
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import operator
-import os
 import random
 from itertools import product, pairwise
 from operator import itemgetter
@@ -126,7 +125,7 @@ def rand_opt(level, path):
             break
         cand = None
         if path[i] - path[i+2] in dirs8:
-            path = path[:i] + path[i+2:]
+            path = path[:i+1] + path[i+2:]
             continue
         elif (path[i] - path[i+2]).manhatten() == 2:
             cand = (path[i] + path[i+2])/2
@@ -134,7 +133,7 @@ def rand_opt(level, path):
             middle = (path[i] + path[i+2])/2
             cand = middle-(path[i+1]-middle)
 
-        if cand is not None and level[cand] == "W":
+        if cand is not None and level[cand] == "W" and cand not in path:
             path[i+1] = cand
 
     return path
@@ -167,37 +166,3 @@ def run_level(infile: str, input: List[str], outfile: str) -> str:
     level = {Vec(x, y): c for y, l in enumerate(input[1:size + 1]) for x, c in enumerate(l)}
     coords = [Vec(*map(int, l.split(","))) for l in input[size + 2:]]
     return "\n".join(" ".join(f"{c[0]},{c[1]}" for c in encircle_opt(level, a)) for a in coords)
-
-
-#####################################
-
-def is_input_file(infile: str) -> bool:
-    return infile.endswith('.in')
-
-
-def get_outfile(infile: str) -> str:
-    return infile.split('.in')[0] + '.out'
-
-
-if __name__ == '__main__':
-    level = os.path.basename(__file__).split('.py')[0]
-    print(os.getcwd())
-
-    leveldir = os.path.join(os.path.dirname(__file__), '../levels/' + level + '/')
-    for file in os.listdir(leveldir):
-        infile = leveldir + file
-
-        if not is_input_file(infile):
-            continue
-
-        with open(infile) as f:
-            content = f.readlines()
-
-        outfile = get_outfile(infile)
-        result = run_level(infile, content, outfile)
-
-        if result and len(result) > 0:
-            with open(outfile, 'w') as f:
-                f.write(result)
-                f.write('\n')
-        print(f"completed {file}")
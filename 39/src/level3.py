@@ -5,7 +5,6 @@ from functools import reduce
 from itertools import accumulate
 import math
 import operator
-import os
 from typing import List
 
 class Vec(tuple[int, ...]):
@@ -62,37 +61,3 @@ def run_yard(mapp, path):
     if max(Counter(poss).values()) == 1 and all(c in poss for c, t in mapp.items() if t == '.') and all(mapp.get(p, '#') == '.' for p in poss):
         return 'VALID'
     return 'INVALID'
-
-
-
-#####################################
-
-def is_input_file(infile: str) -> bool:
-    return infile.endswith('.in')
-
-
-def get_outfile(infile: str) -> str:
-    return infile.split('.in')[0] + '.out'
-
-
-if __name__ == '__main__':
-    level = os.path.basename(__file__).split('.py')[0]
-    print(os.getcwd())
-
-    leveldir = os.path.join(os.path.dirname(__file__), '../levels/' + level + '/')
-    for file in os.listdir(leveldir):
-        infile = leveldir + file
-
-        if not is_input_file(infile):
-            continue
-
-        with open(infile) as f:
-            content = f.readlines()
-
-        outfile = get_outfile(infile)
-        result = run_level(infile, content, outfile)
-
-        if result and len(result) > 0:
-            with open(outfile, 'w') as f:
-                f.write(result)
-                f.write('\n')
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import itertools
 import operator
 import random
-from collections import Counter, defaultdict
+import sys
+from collections import Counter
 from itertools import accumulate
 from typing import List, Iterator
 
+from ccc.grid import Grid
+
 
 class Vec(tuple[int, ...]):
     def __new__(cls, *args: int | float):
@@ -49,15 +53,14 @@ def split_input(inp: List[str]) -> Iterator[tuple]:
     i = 1
     while i < len(inp):
         width, height = Vec(*map(int, inp[i].split(" ")))
-        mapp = {Vec(x, y): inp[i + 1 + y][x] for x in range(width) for y in range(height)}
+        mapp = Grid.parse([line[:width] for line in inp[i + 1 : i + 1 + height]], default="#", key=Vec)
         i += height + 1
         yield (mapp,)
 
 
 def solve(mapp) -> str | Iterator[str]:
-    mapp = defaultdict(lambda: "#", mapp)
     path = ""
-    poss = [[p for p, c in mapp.items() if c == "X"][0] + dirs[random.choice("WASD")]]  # maybe?
+    poss = [mapp.positions("X")[0] + dirs[random.choice("WASD")]]  # maybe?
     d = random.choice("WASD")
     for i in itertools.count():
         pos = poss[-1]
@@ -74,9 +77,9 @@ def solve(mapp) -> str | Iterator[str]:
             else:
                 yield path
                 if i < 1000 or i % 2 == 0:
-                    poss = [[p for p, c in mapp.items() if c == "X"][0] + dirs[random.choice("WASD")]]
+                    poss = [mapp.positions("X")[0] + dirs[random.choice("WASD")]]
                 else:
-                    poss = [random.choice([p for p, c in mapp.items() if c == "."])]
+                    poss = [random.choice(mapp.positions("."))]
                 path = ""
 
 
@@ -84,123 +87,27 @@ def validate(path, mapp) -> bool:
     poss = [Vec(0, 0)] + list(accumulate((dirs[x] for x in path), operator.add))
     mins = Vec(*map(min, zip(*poss)))
     poss = [p - mins for p in poss]
-    return max(Counter(poss).values()) == 1 and all(c in poss for c, t in mapp.items() if t == ".") and all(
-        mapp.get(p, "#") == "." for p in poss)
+    visited = set(poss)
+    return max(Counter(poss).values()) == 1 and all(c in visited for c in mapp.positions(".")) and all(
+        mapp[p] == "." for p in poss)
 
 
 ##################################################
 WORKERS = 32
 RECOMPUTE = True
 CACHING = True
+SEED = 0
+PART_DEADLINE = None  # seconds, then trial-and-error parts settle for the best candidate by score()
+FILE_DEADLINE = None
+PROFILE = False  # cProfile every part, reports end up in levels/<level>/profile
+TELEMETRY = False  # candidate counts and generate/validate times per part, in <file>.telemetry.jsonl
+MEMORY = False  # tracemalloc every part, peaks and top allocation sites in <file>.memory.jsonl
+CHECKPOINT = None  # seconds between saves of unfinished searches, an interrupted run then resumes
+DEDUP = None  # bytes for a filter of seen candidates shared by the workers, repeats skip validate
+FAIL_FAST = False  # stop at the first example part that differs, or with --check the first invalid one
 ##################################################
 
-import filecmp  # noqa: E402
-import functools  # noqa: E402
-import inspect  # noqa: E402
-import itertools  # noqa: E402
-import multiprocessing  # noqa: E402
-import re  # noqa: E402
-import sys  # noqa: E402
-from concurrent import futures  # noqa: E402
-from pathlib import Path  # noqa: E402
-
-from tqdm.contrib import tmap  # noqa: E402
-from tqdm.contrib.concurrent import process_map  # noqa: E402
-
-level = Path(__file__).name.split(".py")[0]
-leveldir = Path(__file__).parents[1] / "levels" / level
-partsdir = leveldir / "parts"
-is_trial_and_error = inspect.isgeneratorfunction(solve)
-
-
-def _solve_worker(inp, stop_event):
-    for candidate in solve(*inp):
-        if validate(candidate, *inp):
-            return candidate
-        if stop_event.is_set():
-            return None
-
-
-def _solve(inp, index):
-    if not is_trial_and_error:
-        res = solve(*inp)
-        if not validate(res, *inp):
-            print(f"⚠️ Failed to validate part {index}")
-        return res
-    if WORKERS == 1:
-        for candidate in solve(*inp):
-            if validate(candidate, *inp):
-                return candidate
-    else:
-        with multiprocessing.Manager() as manager:
-            stopping_event = manager.Event()
-            with futures.ProcessPoolExecutor(max_workers=WORKERS) as executor:
-                tasks = [executor.submit(_solve_worker, inp, stopping_event) for _ in range(WORKERS)]
-                futures.wait(tasks, return_when=futures.FIRST_COMPLETED)
-                res = next(futures.as_completed(tasks)).result()
-                stopping_event.set()
-        return res
-
-
-def _solve_cached(inp, index: int, outfile: Path):
-    if not CACHING:
-        return _solve(inp, index)
-    partfile = partsdir / (outfile.name + f".{index}")
-    if partfile.exists():
-        with partfile.open() as f:
-            return f.read()
-    else:
-        res = _solve(inp, index)
-        with partfile.open(mode="w") as f:
-            f.write(res)
-        return res
-
-
-def _run_file(infile, outfile):
-    with open(leveldir / infile) as f:
-        content = f.readlines()
-
-    print(f"{infile.name}")
-    preprocessed_input = list(split_input(content))
-
-    if WORKERS > 1 and not is_trial_and_error:
-        cmap = functools.partial(process_map, max_workers=WORKERS)
-    else:
-        cmap = tmap
-    cmap = functools.partial(cmap, miniters=1, file=sys.stdout, mininterval=0)
-    results = list(cmap(_solve_cached, preprocessed_input, itertools.count(), itertools.repeat(outfile)))
-
-    if results and len(results) > 0:
-        with open(leveldir / outfile, "w") as f:
-            f.write("\n".join(results))
-            f.write("\n")
-
-
-def _main():
-    if CACHING:
-        partsdir.mkdir(exist_ok=True)
-        if RECOMPUTE:
-            for f in partsdir.iterdir():
-                f.unlink()
-
-    for file in leveldir.iterdir():
-        if re.match(r"level\d+_\d+\.out", file.name):
-            file.unlink()
-
-    example_in_file = leveldir / (level + "_example.in")
-    if not example_in_file.exists():
-        print("⚠️ No example file found")
-    else:
-        _run_file(example_in_file, example_in_file.with_suffix(".out.computed"))
-        if filecmp.cmp(example_in_file.with_suffix(".out"), example_in_file.with_suffix(".out.computed")):
-            print("✅ Example check passed")
-        else:
-            print("⚠️ Example check failed")
-
-    for file in leveldir.iterdir():
-        if re.match(r"level\d+_\d+\.in", file.name):
-            _run_file(file, file.with_suffix(".out"))
-
-
 if __name__ == "__main__":
-    _main()
+    from ccc import runner
+
+    runner.main(sys.modules[__name__])
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+from ccc.contests import contests, inputs, levels, load_level, root
+
+
+def protocol(level: Path) -> str:
+    # from the source, so listing levels imports none of them
+    return "run_level" if "def run_level" in level.read_text() else "solve"
+
+
+def run_old(module, level: Path):
+    # levels written before the runner: run_level gets the whole file and returns its output
+    for infile in inputs(level):
+        with open(infile) as f:
+            content = f.readlines()
+        outfile = infile.with_suffix(".out")
+        result = module.run_level(str(infile), content, str(outfile))
+        if result:
+            # renamed into place, an interrupted write never leaves a truncated output
+            partial = outfile.with_name(outfile.name + ".partial")
+            with open(partial, "w") as f:
+                f.write(result)
+                f.write("\n")
+            os.replace(partial, outfile)
+        print(infile.name)
+
+
+def find(contest: str, level: str | None) -> Path | list[Path]:
+    contest_dir = root / contest
+    if contest_dir not in contests():
+        sys.exit(f"no contest {contest}, there are {', '.join(c.name for c in contests())}")
+    if level is None:
+        return levels(contest_dir)
+    name = level if level.startswith("level") else f"level{level}"
+    for f in levels(contest_dir):
+        if f.stem == name:
+            return f
+    sys.exit(f"no {name} in contest {contest}")
+
+
+USAGE = """usage: python -m ccc [contest [level]] [--watch | --check] [--serve address | --worker address]
+
+solves all inputs of a level, e.g. python -m ccc 39 level4 or python -m ccc 39 4
+without a level it lists the contest's levels, without a contest all contests
+--watch   solve again whenever the level is saved, keeping the pool and parsed inputs
+--check   run validate over the existing outputs instead of solving
+--serve   hand the parts to workers that connect to address, [host]:port or a socket path.
+          :port is this machine only, 0.0.0.0:port lets other machines in, only on networks you trust
+--worker  solve parts for the coordinator at address, any number of them on any machine"""
+
+
+def main():
+    # no argparse, it alone costs a good part of the startup budget
+    args = sys.argv[1:]
+    watch = "--watch" in args or "-w" in args
+    checking = "--check" in args
+    args = [a for a in args if a not in ("--watch", "-w", "--check")]
+    addresses = {}
+    for flag in ("--serve", "--worker"):
+        if flag in args:
+            i = args.index(flag)
+            if i + 1 == len(args):
+                sys.exit(USAGE)
+            addresses[flag] = args.pop(i + 1)
+            args.pop(i)
+    if len(addresses) > 1 or checking and (watch or addresses):
+        sys.exit(USAGE)
+    if len(args) > 2 or any(a.startswith("-") for a in args):
+        sys.exit(USAGE)
+    if not args:
+        for contest in contests():
+            print(f"{contest.name}  {' '.join(f.stem for f in levels(contest))}")
+        return
+    found = find(args[0], args[1] if len(args) > 1 else None)
+    if isinstance(found, list):
+        for f in found:
+            print(f"{f.stem:8} {protocol(f):9} {len(inputs(f))} inputs")
+        return
+
+    module = load_level(found)
+    if hasattr(module, "run_level"):
+        if watch or checking or addresses:
+            sys.exit("--watch, --check, --serve and --worker need a level that runs on the runner")
+        run_old(module, found)
+    elif checking:
+        from ccc import runner
+
+        runner.check(module)
+    elif "--worker" in addresses:
+        from ccc import runner
+
+        runner.work(module, addresses["--worker"])
+    else:
+        from ccc import runner
+
+        runner.main(module, watch, addresses.get("--serve"))
+
+
+if __name__ == "__main__":
+    main()
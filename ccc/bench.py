@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ccc.contests import contests, inputs, levels, load_level, root
+from ccc.generate import GENERATORS, generate
+
+WALL_FLOOR = 0.05  # seconds, differences below that are noise
+RSS_FLOOR = 4096  # KB
+
+
+def solve_file(module, content: list[str]) -> tuple[str, bool | None]:
+    # (output, valid) the way the level's own runner would produce it, but sequential
+    # and without caching. valid is None for levels without a validate function
+    if hasattr(module, "run_level"):
+        return module.run_level("", content, ""), None
+    random.seed(0)
+    results, valid = [], True
+    for inp in module.split_input(content):
+        if inspect.isgeneratorfunction(module.solve):
+            res = next(c for c in module.solve(*inp) if module.validate(c, *inp))
+        else:
+            res = module.solve(*inp)
+        valid = valid and bool(module.validate(res, *inp))
+        results.append(res)
+    return "\n".join(results), valid
+
+
+def _measure(level: Path, infile: Path, outfile: Path):
+    # runs in a fresh interpreter per input, so peak RSS belongs to this input alone
+    module = load_level(level)
+    with open(infile) as f:
+        content = f.readlines()
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    result, valid = solve_file(module, content)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    with open(outfile, "w") as f:
+        if result:
+            f.write(result)
+            f.write("\n")
+    cpu = after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime
+    print(json.dumps(dict(wall_s=wall, cpu_s=cpu, peak_rss_kb=after.ru_maxrss, valid=valid)))
+
+
+def _lines(path: Path) -> list[str]:
+    with open(path) as f:
+        return [line.rstrip() for line in f.read().rstrip().splitlines()]
+
+
+def run(level: Path, infile: Path, timeout: float) -> dict:
+    res = dict(contest=level.parents[1].name, level=level.stem, input=infile.name)
+    reference = infile.with_suffix(".out")
+    with tempfile.TemporaryDirectory() as tmp:
+        outfile = Path(tmp) / reference.name
+        cmd = [sys.executable, "-m", "ccc.bench", "--measure", str(level), str(infile), str(outfile)]
+        try:
+            proc = subprocess.run(cmd, cwd=root, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return res | dict(status="timeout")
+        if proc.returncode != 0:
+            return res | dict(status="error", error=proc.stderr.strip().splitlines()[-1:])
+        res |= json.loads(proc.stdout.splitlines()[-1])
+        # trial-and-error levels may find other valid answers than the stored ones
+        valid = res.pop("valid")
+        if valid is not None and inspect.isgeneratorfunction(load_level(level).solve):
+            status = "ok" if valid else "wrong"
+        elif not reference.exists():
+            status = "unchecked"
+        else:
+            status = "ok" if _lines(outfile) == _lines(reference) else "wrong"
+    return res | dict(status=status)
+
+
+def synthetic(level: Path, sizes: list[int], timeout: float) -> list[dict]:
+    contest, number = level.parents[1].name, int(level.stem.removeprefix("level"))
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            infile = Path(tmp) / f"{level.stem}_synthetic_{size}.in"
+            infile.write_text(generate(contest, number, size))
+            runs.append(run(level, infile, timeout) | dict(size=size))
+    return runs
+
+
+def chart(runs: list[dict]):
+    # runtime and memory over input size, one block per level
+    width = 40
+    for key in dict.fromkeys((r["contest"], r["level"]) for r in runs):
+        rows = [r for r in runs if (r["contest"], r["level"]) == key]
+        longest = max((r.get("wall_s", 0) for r in rows), default=0) or 1
+        print(f"\n{key[0]} {key[1]}")
+        for r in rows:
+            if "wall_s" not in r:
+                print(f"{r['size']:8} {r['status']}")
+                continue
+            bar = "█" * round(width * r["wall_s"] / longest)
+            print(f"{r['size']:8} {r['wall_s']:9.3f}s {r['peak_rss_kb'] / 1024:7.1f} MB {bar}")
+
+
+def compare(runs: list[dict], previous: list[dict], threshold: float) -> list[str]:
+    old = {(r["contest"], r["level"], r["input"]): r for r in previous}
+    regressions = []
+    for r in runs:
+        before = old.get((r["contest"], r["level"], r["input"]))
+        if before is None:
+            continue
+        name = f"{r['contest']}/{r['level']}/{r['input']}"
+        if before["status"] == "ok" and r["status"] != "ok":
+            regressions.append(f"{name}: {before['status']} -> {r['status']}")
+            continue
+        for metric, floor in (("wall_s", WALL_FLOOR), ("cpu_s", WALL_FLOOR), ("peak_rss_kb", RSS_FLOOR)):
+            if metric in r and metric in before and r[metric] - before[metric] > max(floor, before[metric] * threshold):
+                regressions.append(f"{name}: {metric} {before[metric]:.3f} -> {r[metric]:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ccc.bench", description="run every level on its stored inputs")
+    parser.add_argument("contest", nargs="?", help="only this contest, e.g. 39")
+    parser.add_argument("level", nargs="?", help="only this level, e.g. level3")
+    parser.add_argument("-o", "--output", type=Path, default=root / "bench.json")
+    parser.add_argument("-c", "--compare", type=Path, help="results of an earlier run to check for regressions")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25, help="relative slowdown that counts as regression")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per input")
+    parser.add_argument("--sizes", type=int, nargs="+", help="run generated inputs of these sizes instead, see ccc.generate")
+    parser.add_argument("--measure", nargs=3, type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(*args.measure)
+        return
+
+    runs = []
+    for contest in contests():
+        if args.contest and contest.name != args.contest:
+            continue
+        for level in levels(contest):
+            if args.level and level.stem != args.level:
+                continue
+            if args.sizes:
+                if contest.name in GENERATORS:
+                    runs += synthetic(level, args.sizes, args.timeout)
+                continue
+            for infile in inputs(level):
+                r = run(level, infile, args.timeout)
+                runs.append(r)
+                metrics = f"{r['wall_s']:8.3f}s {r['cpu_s']:8.3f}s cpu {r['peak_rss_kb'] / 1024:7.1f} MB" if "wall_s" in r else ""
+                print(f"{contest.name} {level.stem:8} {infile.name:20} {r['status']:9} {metrics}")
+
+    with open(args.output, "w") as f:
+        json.dump(dict(created=time.time(), python=platform.python_version(), runs=runs), f, indent=1)
+
+    if args.sizes:
+        chart(runs)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(runs, json.load(f)["runs"], args.threshold)
+        for line in regressions:
+            print(f"⚠️ {line}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+
+root = Path(__file__).parents[1]
+
+
+def contests() -> list[Path]:
+    return sorted(d for d in root.iterdir() if re.fullmatch(r"\d+", d.name) and (d / "src").is_dir())
+
+
+def levels(contest: Path) -> list[Path]:
+    # solver files that have a levels directory of their own, so no level4_old.py
+    return sorted(
+        (f for f in (contest / "src").glob("level*.py") if (contest / "levels" / f.stem).is_dir()),
+        key=lambda f: int(re.sub(r"\D", "", f.stem)),
+    )
+
+
+def inputs(level: Path) -> list[Path]:
+    leveldir = level.parents[1] / "levels" / level.stem
+    files = [f for f in leveldir.iterdir() if re.fullmatch(r"level\d+_(\d+|example)\.in", f.name)]
+    return sorted(files, key=lambda f: (not f.stem.endswith("example"), len(f.name), f.name))
+
+
+def load_level(level: Path) -> ModuleType:
+    # the level's src directory goes on sys.path, just like running the file directly
+    if str(level.parent) not in sys.path:
+        sys.path.insert(0, str(level.parent))
+    spec = importlib.util.spec_from_file_location(f"{level.parents[1].name}_{level.stem}", level)
+    module = importlib.util.module_from_spec(spec)
+    # registered, so pool workers can unpickle the level's own classes
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
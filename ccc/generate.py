@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from collections import Counter
+from collections.abc import Callable
+
+# Synthetic inputs in the format of each contest, for stress tests that go beyond the
+# stored inputs. size is the one knob per contest:
+#   35  number of functions in the program, statements of the only function in levels 1 and 2
+#   36  side length of the Pacman board
+#   37  number of tournaments, with at least size fighters each
+#   38  side length of the map, also the number of queries
+#   39  side length of the lawns
+
+WORDS = ["hello", "world", "ccc", "true", "false", "1", "2", "love"]
+NAMES = ["a", "b", "c", "x", "y"]
+
+
+def programs(level: int, size: int, rng: random.Random) -> list[str]:
+    lines = []
+
+    def value(i):
+        r = rng.random()
+        # only later functions are called, so every program terminates
+        if level >= 5 and i < size and r < 0.1:
+            return f"call {rng.randint(i + 1, size)}"
+        if level >= 3 and r < 0.4:
+            return rng.choice(NAMES)
+        return rng.choice(WORDS)
+
+    def block(i, depth, statements):
+        kinds = ["print", "print"]
+        if level >= 2:
+            kinds += ["return"] + ["if"] * (depth < 3)
+        if level >= 3:
+            kinds += ["var", "set"]
+        if level >= 4 and depth < 3:
+            kinds += ["postpone"]
+        if level >= 5 and i < size:
+            kinds += ["call"]
+        if level >= 6 and depth < 3:
+            kinds += ["try"]
+        for _ in range(statements):
+            match rng.choice(kinds):
+                case "print" | "return" as kind:
+                    lines.append(f"{kind} {value(i)}")
+                case "var" | "set" as kind:
+                    lines.append(f"{kind} {rng.choice(NAMES)} {value(i)}")
+                case "call":
+                    lines.append(f"call {rng.randint(i + 1, size)}")
+                case "if":
+                    cond = rng.choice(NAMES) if level >= 3 and rng.random() < 0.3 else rng.choice(["true", "false"])
+                    lines.append(f"if {cond}")
+                    block(i, depth + 1, rng.randint(1, 3))
+                    lines.append("end")
+                    lines.append("else")
+                    block(i, depth + 1, rng.randint(1, 3))
+                    lines.append("end")
+                case "postpone":
+                    lines.append("postpone")
+                    block(i, depth + 1, rng.randint(1, 3))
+                    lines.append("end")
+                case "try":
+                    lines.append("try")
+                    block(i, depth + 1, rng.randint(1, 3))
+                    lines.append("end")
+                    lines.append("catch")
+                    block(i, depth + 1, rng.randint(1, 3))
+                    lines.append("end")
+
+    if level <= 2:
+        lines.append("start")
+        block(1, 0, size)
+        lines.append("end")
+    for i in range(1, size + 1 if level > 2 else 1):
+        lines.append("start")
+        block(i, 0, rng.randint(1, 8))
+        lines.append("end")
+    return [str(len(lines))] + lines
+
+
+PACMAN_DIRS = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}
+
+
+def _maze(size: int, rng: random.Random) -> set[tuple[int, int]]:
+    # depth first maze on the odd cells with some extra openings for loops, 0-based (row, col)
+    start = (1, 1)
+    open_cells, stack = {start}, [start]
+    while stack:
+        r, c = stack[-1]
+        steps = [(dr, dc) for dr, dc in PACMAN_DIRS.values()
+                 if 0 < r + 2 * dr < size - 1 and 0 < c + 2 * dc < size - 1 and (r + 2 * dr, c + 2 * dc) not in open_cells]
+        if not steps:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(steps)
+        open_cells |= {(r + dr, c + dc), (r + 2 * dr, c + 2 * dc)}
+        stack.append((r + 2 * dr, c + 2 * dc))
+    for _ in range(size * size // 10):
+        r, c = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if ((r - 1, c) in open_cells and (r + 1, c) in open_cells) or ((r, c - 1) in open_cells and (r, c + 1) in open_cells):
+            open_cells.add((r, c))
+    return open_cells
+
+
+def _walk(open_cells, pos, length, rng: random.Random) -> str:
+    moves = ""
+    for _ in range(length):
+        options = [(d, (pos[0] + dr, pos[1] + dc)) for d, (dr, dc) in PACMAN_DIRS.items()
+                   if (pos[0] + dr, pos[1] + dc) in open_cells]
+        d, pos = rng.choice(options)
+        moves += d
+    return moves
+
+
+def pacman(level: int, size: int, rng: random.Random) -> list[str]:
+    size = max(size, 5)
+    open_cells = _maze(size, rng)
+    cells = sorted(open_cells)
+    pac = rng.choice(cells)
+    ghosts = []
+    if level == 4:
+        # standing ghosts only in dead ends, so they never cut off coins
+        ends = [p for p in cells if p != pac and sum((p[0] + dr, p[1] + dc) in open_cells for dr, dc in PACMAN_DIRS.values()) == 1]
+        ghosts = rng.sample(ends, min(len(ends), max(1, size // 4)))
+    elif level in (3, 5, 6):
+        ghosts = rng.sample([p for p in cells if p != pac], min(len(cells) - 1, max(1, size // 4)))
+    board = [["W"] * size for _ in range(size)]
+    for r, c in cells:
+        board[r][c] = "C" if level < 5 or rng.random() < 0.3 else "E"
+    for r, c in ghosts:
+        board[r][c] = "G"
+    if level > 1:
+        board[pac[0]][pac[1]] = "P"
+    lines = [str(size)] + ["".join(row) for row in board]
+    if level == 1:
+        return lines
+    lines.append(f"{pac[0] + 1} {pac[1] + 1}")
+    if level in (2, 3):
+        moves = _walk(open_cells, pac, 2 * size, rng)
+        lines += [str(len(moves)), moves]
+    if level in (3, 5, 6):
+        lines.append(str(len(ghosts)))
+        for g in ghosts:
+            # level 3 ghosts move in lockstep with pacman, later ones patrol back and forth
+            moves = _walk(open_cells, g, 2 * size if level == 3 else rng.randint(1, 5), rng)
+            lines += [f"{g[0] + 1} {g[1] + 1}", str(len(moves)), moves]
+    if level >= 4:
+        lines.append(str(max(25000, 4 * size * size)))
+    return lines
+
+
+RPS_WINS = {"P": "R", "R": "S", "S": "P"}
+RPSYL_WINS = {"P": "RY", "R": "SL", "S": "PL", "Y": "RS", "L": "YP"}
+
+
+def _bracket(winner: str, rounds: int, wins: dict[str, str], rng: random.Random) -> str:
+    # a starting order of 2**rounds fighters that winner wins
+    if rounds == 0:
+        return winner
+    other = rng.choice(winner + wins[winner])
+    a, b = _bracket(winner, rounds - 1, wins, rng), _bracket(other, rounds - 1, wins, rng)
+    return a + b if rng.random() < 0.5 else b + a
+
+
+def tournaments(level: int, size: int, rng: random.Random) -> list[str]:
+    rounds = max(2, (size - 1).bit_length())
+    if level == 1:
+        return [str(size)] + ["".join(rng.choices("RPS", k=2)) for _ in range(size)]
+    if level == 2:
+        return [f"{size} {2 ** rounds}"] + ["".join(rng.choices("RPS", k=2 ** rounds)) for _ in range(size)]
+    lines = [f"{size} {2 ** rounds}"]
+    for _ in range(size):
+        if level == 3:
+            # no rock may survive the first two rounds
+            order = "".join(_bracket(rng.choice("PS"), 2, RPS_WINS, rng) for _ in range(2 ** rounds // 4))
+        else:
+            order = _bracket("S", rounds, RPS_WINS if level == 4 else RPSYL_WINS, rng)
+        counts = Counter(order)
+        lines.append(" ".join(f"{counts[k]}{k}" for k in ("RPS" if level < 5 else "RPSYL")))
+    return lines
+
+
+ISLAND_DIRS = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+
+
+def _shore(land: set[tuple[int, int]], x: int, y: int) -> tuple[int, int]:
+    # level 5 starts its route on the first water east of the queried cell
+    while (x, y) in land:
+        x += 1
+    return x, y
+
+
+def _coast(land: set[tuple[int, int]], start: tuple[int, int]) -> list[tuple[int, int]] | None:
+    # the route level 5 walks from start with the coast on one hand. None if it visits a
+    # cell twice or passes next to itself further on, which one-cell-wide bays and inlets
+    # make it do. level 5 asserts the former, the shortcuts of level 7 trip over the latter
+    coast = (start[0] - 1, start[1])
+    pos, path = start, []
+    while not path or pos != start:
+        path.append(pos)
+        if len(path) > 4 * len(land) + 8:
+            return None
+        for _ in range(4):
+            d = ISLAND_DIRS.index((pos[0] - coast[0], pos[1] - coast[1]))
+            dx, dy = ISLAND_DIRS[d - 2]
+            candidate = (coast[0] + dx, coast[1] + dy)
+            if candidate not in land:
+                pos = candidate
+                break
+            dx, dy = ISLAND_DIRS[d - 1]
+            candidate2 = (coast[0] + dx, coast[1] + dy)
+            if candidate2 not in land:
+                pos, coast = candidate2, candidate
+                break
+            coast = candidate2
+        else:
+            # a lake cell with land on all four sides, the route never gets going
+            return None
+    index = {p: i for i, p in enumerate(path)}
+    if len(index) < len(path):
+        return None
+    for i, (x, y) in enumerate(path):
+        for dx, dy in ISLAND_DIRS:
+            # crossing diagonals are neighbours too, so this also keeps the route from cutting its corners
+            j = index.get((x + dx, y + dy))
+            if j is not None and 2 < (j - i) % len(path) < len(path) - 2:
+                return None
+    return path
+
+
+def islands(level: int, size: int, rng: random.Random) -> list[str]:
+    size = max(size, 5)
+    land = set()
+    neighbours4 = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+    neighbours8 = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    for _ in range(size * size):
+        if len(land) > size * size // 3:
+            break
+        x, y = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        blob, cells = {(x, y)}, [(x, y)]
+        for _ in range(rng.randint(0, max(1, size * size // 20))):
+            bx, by = rng.choice(cells)
+            dx, dy = rng.choice(neighbours4)
+            if 0 < bx + dx < size - 1 and 0 < by + dy < size - 1 and (bx + dx, by + dy) not in blob:
+                blob.add((bx + dx, by + dy))
+                cells.append((bx + dx, by + dy))
+        # islands never touch, not even diagonally
+        if any((bx + dx, by + dy) in land for bx, by in blob for dx, dy in neighbours8 + [(0, 0)]):
+            continue
+        # every cell of the island has to lead to one clean route around it, no lakes inside
+        route = _coast(blob, _shore(blob, x, y))
+        if route and len(route) <= 500 and {_shore(blob, *p) for p in blob} <= set(route):
+            land |= blob
+    lines = [str(size)] + ["".join("L" if (x, y) in land else "W" for x in range(size)) for y in range(size)]
+
+    ocean, todo = {(0, 0)}, [(0, 0)]
+    while todo:
+        x, y = todo.pop()
+        for dx, dy in neighbours4:
+            p = (x + dx, y + dy)
+            if 0 <= p[0] < size and 0 <= p[1] < size and p not in land and p not in ocean:
+                ocean.add(p)
+                todo.append(p)
+    land_cells, ocean_cells = sorted(land), sorted(ocean)
+    water = set(ocean_cells)
+
+    def fmt(*cells):
+        return " ".join(f"{x},{y}" for x, y in cells)
+
+    def route():
+        # random 8-connected walk over water, crossing itself now and then
+        cells = [rng.choice(ocean_cells)]
+        for _ in range(rng.randint(1, 2 * size)):
+            x, y = cells[-1]
+            options = [(x + dx, y + dy) for dx, dy in neighbours8 if (x + dx, y + dy) in water and (x + dx, y + dy) not in cells[-2:]]
+            if not options:
+                break
+            cells.append(rng.choice(options))
+        return cells
+
+    queries = []
+    for _ in range(size):
+        match level:
+            case 1:
+                queries.append(fmt((rng.randrange(size), rng.randrange(size))))
+            case 2:
+                queries.append(fmt(*rng.sample(land_cells, 2)) if len(land_cells) > 1 else fmt(land_cells[0], land_cells[0]))
+            case 3:
+                queries.append(fmt(*route()))
+            case 4:
+                queries.append(fmt(*rng.sample(ocean_cells, 2)))
+            case _:
+                queries.append(fmt(rng.choice(land_cells)))
+    return lines + [str(len(queries))] + queries
+
+
+LAWN_DIRS = {"W": (0, -1), "S": (0, 1), "A": (-1, 0), "D": (1, 0)}
+
+
+def _mow(width: int, height: int, rng: random.Random) -> list[tuple[int, int]]:
+    # random hamiltonian path over the lawn: boustrophedon, then backbite moves
+    path = [(x if y % 2 == 0 else width - 1 - x, y) for y in range(height) for x in range(width)]
+    for _ in range(20 * (width + height)):
+        if rng.random() < 0.5:
+            path.reverse()
+        x, y = path[-1]
+        dx, dy = rng.choice(list(LAWN_DIRS.values()))
+        if not (0 <= x + dx < width and 0 <= y + dy < height) or len(path) < 2 or (x + dx, y + dy) == path[-2]:
+            continue
+        i = path.index((x + dx, y + dy))
+        path[i + 1:] = path[:i:-1]
+    return path
+
+
+def _moves(path) -> str:
+    steps = {v: k for k, v in LAWN_DIRS.items()}
+    return "".join(steps[(b[0] - a[0], b[1] - a[1])] for a, b in zip(path, path[1:], strict=False))
+
+
+def lawns(level: int, size: int, rng: random.Random) -> list[str]:
+    size = max(size, 2)
+    count = 10
+    lines = [str(count)]
+    for _ in range(count):
+        width, height = rng.randint(max(2, size // 2), size), rng.randint(max(2, size // 2), size)
+        path = _mow(width, height, rng)
+        # the tree stands where the mower would have finished
+        tree, path = path[-1], path[:-1]
+        if level <= 2:
+            lines.append(_moves(path))
+            continue
+        lines.append(f"{width} {height}")
+        lines += ["".join("X" if (x, y) == tree else "." for x in range(width)) for y in range(height)]
+        if level == 3:
+            moves = _moves(path)
+            if moves and rng.random() < 0.5:
+                i = rng.randrange(len(moves))
+                moves = moves[:i] + rng.choice("WASD") + moves[i + 1:]
+            lines.append(moves)
+    return lines
+
+
+GENERATORS: dict[str, Callable[[int, int, random.Random], list[str]]] = {
+    "35": programs,
+    "36": pacman,
+    "37": tournaments,
+    "38": islands,
+    "39": lawns,
+}
+
+
+def generate(contest: str, level: int, size: int, seed: int = 0) -> str:
+    rng = random.Random(f"{contest}:{level}:{size}:{seed}")
+    return "\n".join(GENERATORS[contest](level, size, rng)) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ccc.generate", description="write a synthetic input")
+    parser.add_argument("contest", choices=sorted(GENERATORS))
+    parser.add_argument("level", help="e.g. level3 or 3")
+    parser.add_argument("-s", "--size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write, default stdout")
+    args = parser.parse_args()
+
+    text = generate(args.contest, int(args.level.removeprefix("level")), args.size, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+
+import numpy as np
+
+
+def _pair(x: int, y: int) -> tuple[int, int]:
+    return x, y
+
+
+def _axis(index: int | slice, origin: int, size: int) -> int | slice | None:
+    # the cells along one axis that a position or a slice of positions selects. positions
+    # outside the board select nothing, negative ones too, so nothing wraps around.
+    # None for a single position outside
+    if not isinstance(index, slice):
+        index -= origin
+        return index if 0 <= index < size else None
+    step = index.step or 1
+    if step > 0:
+        start = 0 if index.start is None else index.start - origin
+        stop = size if index.stop is None else min(index.stop - origin, size)
+        if start < 0:
+            start -= start // step * step
+        return slice(start, max(start, stop), step)
+    start = size - 1 if index.start is None else index.start - origin
+    stop = -1 if index.stop is None else max(index.stop - origin, -1)
+    if start >= size:
+        start += -((start - size + 1) // step) * step
+    if start <= stop:
+        return slice(0, 0)
+    return slice(start, None if stop < 0 else stop, step)
+
+
+class Grid:
+    # a board of single characters in a 2D uint8 array, a drop-in for the dicts keyed
+    # by (x, y) or Vec that levels build per cell. grid[x, y] is row y, column x.
+    # reading outside the board gives default, or a KeyError if default is None,
+    # like a plain dict. keys come out as key(x, y), e.g. key=Vec
+    def __init__(
+        self,
+        cells: np.ndarray,
+        default: str | None = None,
+        origin: tuple[int, int] = (0, 0),
+        key: Callable[[int, int], tuple] = _pair,
+    ):
+        self.cells = cells
+        self.default = default
+        self.origin = origin
+        self.key = key
+        # plain attributes, indexing is the hot path
+        self.height, self.width = cells.shape
+        self._ox, self._oy = origin
+        self._positions = {}  # char -> positions(char), until the next write
+        # writes through this grid or any view on the same cells, shared by transpose()
+        # and slices, so a cache here notices writes made through another view
+        self._writes = [0]
+        self._seen = 0
+
+    def __getstate__(self):
+        return self.cells, self.default, self.origin, self.key
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @classmethod
+    def parse(cls, lines: list[str], default: str | None = None, origin=(0, 0), key=_pair) -> Grid:
+        # every row has to be as wide as the first, padding would make cells of the board
+        rows = [line.rstrip("\r\n") for line in lines]
+        width = len(rows[0]) if rows else 0
+        for y, row in enumerate(rows):
+            if len(row) != width:
+                raise ValueError(f"row {y} has {len(row)} cells, the first one {width}")
+        data = "".join(rows).encode("latin-1")
+        cells = np.frombuffer(data, dtype=np.uint8).reshape(len(rows), width).copy()
+        return cls(cells, default, origin, key)
+
+    def transpose(self) -> Grid:
+        # grid[r, c] is row r, column c, as in boards keyed (row, column). shares the cells
+        return self._view(self.cells.T, self.origin[::-1])
+
+    def _view(self, cells: np.ndarray, origin: tuple[int, int]) -> Grid:
+        view = Grid(cells, self.default, origin, self.key)
+        view._writes = self._writes
+        return view
+
+    def _index(self, pos) -> tuple[int, int] | None:
+        x, y = pos[0] - self._ox, pos[1] - self._oy
+        # negative positions are outside, not counted from the end
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y, x
+        return None
+
+    def __getitem__(self, pos):
+        # _index inlined, this runs once per cell a search looks at
+        try:
+            x = pos[0] - self._ox
+            y = pos[1] - self._oy
+        except TypeError:
+            return self._slice(*pos)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return chr(self.cells.item(y, x))
+        if self.default is None:
+            raise KeyError(pos)
+        return self.default
+
+    def _slice(self, xs, ys) -> str | Grid:
+        # grid[x, :] is column x and grid[:, y] row y as strings, two slices give a
+        # grid of that part that keeps its positions. bounds are positions as well,
+        # a row or column outside the board reads as default like a single cell
+        rows, columns = _axis(ys, self._oy, self.height), _axis(xs, self._ox, self.width)
+        if rows is None or columns is None:
+            if self.default is None:
+                raise KeyError((xs, ys))
+            across = range(self.width)[columns] if rows is None else range(self.height)[rows]
+            return self.default * len(across)
+        if not isinstance(xs, slice) or not isinstance(ys, slice):
+            return self.cells[rows, columns].tobytes().decode("latin-1")
+        part = self.cells[rows, columns]
+        return self._view(part, (self._ox + columns.start, self._oy + rows.start))
+
+    def __setitem__(self, pos, c: str):
+        index = self._index(pos)
+        if index is None:
+            raise KeyError(pos)
+        self.cells[index] = ord(c)
+        self._writes[0] += 1
+
+    def row(self, y: int) -> str:
+        return self[:, y]
+
+    def column(self, x: int) -> str:
+        return self[x, :]
+
+    def get(self, pos, default=None):
+        index = self._index(pos)
+        return chr(self.cells.item(index)) if index is not None else default
+
+    def __contains__(self, pos) -> bool:
+        return self._index(pos) is not None
+
+    def __len__(self) -> int:
+        return self.cells.size
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self.keys()
+
+    def keys(self) -> Iterator[tuple]:
+        ox, oy = self.origin
+        return (self.key(ox + x, oy + y) for y in range(self.height) for x in range(self.width))
+
+    def values(self) -> Iterator[str]:
+        return iter(self.cells.tobytes().decode("latin-1"))
+
+    def items(self) -> Iterator[tuple[tuple, str]]:
+        return zip(self.keys(), self.values(), strict=True)
+
+    def positions(self, c: str) -> tuple[tuple, ...]:
+        # of every cell holding c, in row order, found without a python loop over the
+        # board and kept until the next write through grid[x, y] = c, here or in a view
+        if self._seen != self._writes[0]:
+            self._positions.clear()
+            self._seen = self._writes[0]
+        if c not in self._positions:
+            found = np.argwhere(self.cells == ord(c))
+            self._positions[c] = tuple(self.key(self._ox + int(x), self._oy + int(y)) for y, x in found)
+        return self._positions[c]
+
+    def count(self, c: str) -> int:
+        return int(np.count_nonzero(self.cells == ord(c)))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Grid) and self.origin == other.origin and np.array_equal(self.cells, other.cells)
+
+    def __str__(self) -> str:
+        return "\n".join(self.row(y) for y in range(self.origin[1], self.origin[1] + self.height))
+
+    def __repr__(self) -> str:
+        return f"Grid({self.width}x{self.height}, default={self.default!r})"
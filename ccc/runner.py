@@ -0,0 +1,1618 @@
+from __future__ import annotations
+
+import ast
+import difflib
+import hashlib
+import importlib.util
+import inspect
+import json
+import operator
+import os
+import pickle
+import random
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent import futures
+from itertools import batched, count, islice
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+# tqdm, multiprocessing and the profiler are imported where they are needed, so a
+# run that finds everything in the cache starts fast
+if TYPE_CHECKING:
+    import pstats
+
+lvl: ModuleType
+level: str
+leveldir: Path
+profiledir: Path
+cachefile: Path
+fingerprint: bytes
+is_trial_and_error: bool
+strategies: list[str]  # names of the level's solve functions, STRATEGIES or just solve
+wins: dict[str, list] = {}  # strategy -> [races won, seconds spent winning them]
+pool: futures.ProcessPoolExecutor | _Coordinator | None = None
+concurrency = 1  # pool tasks that run at once, WORKERS unless memory runs short
+
+# decided[race % RACE_SLOTS] == race once a race has a winner, its workers poll
+# that after every candidate. lives in shared memory, so polling is a plain load
+RACE_SLOTS = 1024
+decided = None
+races = count(1)
+searches = count(1)  # stand in for the race in the filter's keys when there is no pool
+current_race: int | None = None
+stragglers: list[tuple[float, list[futures.Future]]] = []  # (interrupt at, tasks) of decided races
+# race -> (file deadline, tasks), time.time(). PART_DEADLINE is up to the workers, only
+# they know when they started
+deadlines: dict[int, tuple[float, list[futures.Future]]] = {}
+shared_inputs: dict = {}  # race -> SharedMemory with its pickled input, until its workers are done
+# task callbacks run on the executor's management thread, with a coordinator on the
+# thread of whichever worker finished. they and the main loop settle races and keep
+# wins, stragglers and deadlines under this lock
+settling = threading.RLock()
+CANCEL_GRACE = 0.1  # seconds stragglers get before they are interrupted
+STREAM_WINDOW = 256  # parts per file that are parsed and in flight at the same time
+PROGRESS_INTERVAL = 0.5  # seconds between progress redraws
+CHUNK_SECONDS = 0.05  # estimated work per pool task when parts are cheap
+CACHE_LIMIT = 256 * 2**20  # bytes, least recently used parts are evicted beyond that
+CACHE_BATCH = 64  # parts per commit
+CACHE_COMMIT_INTERVAL = 5  # seconds, for slow parts that would take long to fill a batch
+REPORTED_PARTS = 3  # mismatches and invalid parts shown in detail, the rest only by index
+DIFF_LINES = 8  # per part
+MEMORY_SITES = 5  # allocation sites reported per part
+MEMORY_SAMPLE_INTERVAL = 0.01  # seconds between looks at the traced size
+MEMORY_HEADROOM = 0.8  # share of the available memory the workers may plan to use
+
+cache: sqlite3.Connection
+pending: list[tuple] = []
+last_commit = 0.0
+observed = [0.0, 0]  # seconds and _size of the parts solved so far
+dumps = count()
+warned: set[str] = set()
+
+# watch mode keeps the pool, the parsed inputs and the results of the session
+# between runs. workers reload the level once they get a task of a newer generation
+watching = False
+generation = 0
+WATCH_INTERVAL = 0.1  # seconds between looks at the level's mtime
+parsed: dict[Path, tuple] = {}  # input file -> (stamp, parts)
+solved: dict[str, str] = {}  # part key -> result
+class_sources: dict[str, tuple[type, str]] = {}  # name -> (class, source) of the level's classes
+
+# with CHECKPOINT on, searches save their state every CHECKPOINT seconds and the
+# parts a run finishes are kept until the level has been run to the end, so an
+# interrupted run picks up where it stopped
+resumed: dict[str, str] = {}  # part key -> result of parts an earlier, interrupted run finished
+finished_rows: list[tuple] = []  # (level, key, result, digest) not committed yet
+progress_db: tuple[int, sqlite3.Connection] | None = None  # (pid, connection), one per process
+saving = None  # saves the progress of the search this process is running
+
+# with DEDUP on, every rejected candidate goes into a bloom filter all workers share,
+# keyed by race. a candidate that is in there already skips validate. one that
+# validates never goes in, so racing the same part again finds it again. the filter
+# is cleared before false positives get likely, so a searcher that yields every
+# candidate once could still miss one, it is meant for random generators
+seen: memoryview | None = None  # DEDUP bytes of bits
+seen_stats = None  # [candidates checked, duplicates, inserted since the last clear]
+seen_lock = None
+seen_flush = 0  # candidates between updates of the shared counters, small enough not to overfill
+DEDUP_HASHES = 7
+DEDUP_LOAD = 0.066  # inserts per bit before the filter is cleared, about 0.1% false positives
+DEDUP_FLUSH = 256
+
+
+def _setup(module: ModuleType):
+    global lvl, level, leveldir, profiledir, cachefile, fingerprint, is_trial_and_error, strategies
+    lvl = module
+    level = Path(module.__file__).name.split(".py")[0]
+    leveldir = Path(module.__file__).parents[1] / "levels" / level
+    profiledir = leveldir / "profile"
+    # shared by all levels of a contest, entries are addressed by content
+    cachefile = leveldir.parent / "parts.sqlite"
+    strategies = [f.__name__ for f in getattr(module, "STRATEGIES", [module.solve])]
+    sources = _sources(module, strategies + ["solve", "validate"])
+    sources += [_source(dep) for dep in _local_modules(module)]
+    fingerprint = hashlib.sha256("".join(sources).encode()).digest()
+    is_trial_and_error = inspect.isgeneratorfunction(module.solve)
+    # kept across reloads in watch mode, main writes them back to the cache at the end
+    for name in strategies:
+        wins.setdefault(name, [0, 0.0])
+
+
+def _sources(module: ModuleType, names: list[str]) -> list[str]:
+    # the named functions, every function of the level they use and all of the
+    # level's classes, so editing a helper changes the fingerprint as well. module
+    # level data they read, a table like dirs, counts with the statements assigning it
+    found = {}
+    assigned = _assignments(module)
+    todo = [getattr(module, name) for name in names]
+    todo += [obj for obj in vars(module).values() if inspect.isclass(obj) and obj.__module__ == module.__name__]
+    while todo:
+        obj = todo.pop()
+        if isinstance(obj, str):
+            if f"{obj} =" in found:
+                continue
+            found[f"{obj} ="] = "\n".join(source for source, _ in assigned[obj])
+            used = [name for _, reads in assigned[obj] for name in reads]
+        else:
+            if obj.__name__ in found:
+                continue
+            found[obj.__name__] = _source(obj)
+            used = []
+            codes = [obj.__code__] if inspect.isfunction(obj) else [f.__code__ for f in vars(obj).values() if inspect.isfunction(f)]
+            while codes:
+                code = codes.pop()
+                codes += [c for c in code.co_consts if inspect.iscode(c)]
+                used += code.co_names
+        for name in used:
+            dep = getattr(module, name, None)
+            if name in assigned:
+                todo.append(name)
+            elif (inspect.isfunction(dep) or inspect.isclass(dep)) and dep.__module__ == module.__name__:
+                todo.append(dep)
+    return [found[name] for name in sorted(found)]
+
+
+def _assignments(module: ModuleType) -> dict[str, list[tuple[str, list[str]]]]:
+    # name -> (source, names it reads) of the level's top level statements assigning it
+    try:
+        source = inspect.getsource(module)
+    except (OSError, TypeError):
+        return {}
+    assigned = {}
+    for stmt in ast.parse(source).body:
+        if not isinstance(stmt, ast.Assign | ast.AnnAssign | ast.AugAssign):
+            continue
+        targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+        reads = [node.id for node in ast.walk(stmt) if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)]
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Name):
+                    assigned.setdefault(node.id, []).append((ast.get_source_segment(source, stmt), reads))
+    return assigned
+
+
+def _local_modules(module: ModuleType) -> list[ModuleType]:
+    # modules next to the level or in this package that the level takes anything
+    # from, grid.py and the like, and theirs in turn. they count as the level's code
+    here = {Path(module.__file__).resolve().parent, Path(__file__).resolve().parent}
+    found = {}
+    todo = [module]
+    while todo:
+        for obj in vars(todo.pop()).values():
+            name = obj.__name__ if inspect.ismodule(obj) else getattr(obj, "__module__", None)
+            dep = sys.modules.get(name) if isinstance(name, str) else None
+            file = getattr(dep, "__file__", None)
+            if file is None or dep is module or dep.__name__ in found or dep.__name__ == __name__:
+                continue
+            if Path(file).resolve().parent in here:
+                found[dep.__name__] = dep
+                todo.append(dep)
+    return [found[name] for name in sorted(found)]
+
+
+def _source(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # made at runtime, namedtuples and the like
+        return ""
+
+
+def _load(path: str, name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _classes(module: ModuleType) -> dict[str, tuple[type, str]]:
+    # name -> (class, source) of the classes defined in the level
+    return {
+        name: (obj, _source(obj))
+        for name, obj in vars(module).items()
+        if inspect.isclass(obj) and obj.__module__ == module.__name__
+    }
+
+
+def _reload():
+    # classes whose source is unchanged keep their identity, so the parts parsed
+    # before the edit still pickle and need no parsing again
+    global generation, class_sources
+    module = _load(lvl.__file__, lvl.__name__)
+    fresh = _classes(module)
+    for name, (_, source) in fresh.items():
+        if name in class_sources and class_sources[name][1] == source:
+            setattr(module, name, class_sources[name][0])
+            fresh[name] = class_sources[name]
+    class_sources = fresh
+    _setup(module)
+    generation += 1
+
+
+def _current(gen: int, fn, *args):
+    # every pool task goes through here, a worker still on an older level reloads it first
+    global generation
+    if gen != generation:
+        _setup(_load(lvl.__file__, lvl.__name__))
+        generation = gen
+    return fn(*args)
+
+
+def _seed(index, worker):
+    # every (part, worker) pair gets its own reproducible random stream
+    return f"{lvl.SEED}:{index}:{worker}"
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _interrupt(signum, frame):
+    global current_race
+    if current_race is not None and decided[current_race % RACE_SLOTS] == current_race:
+        current_race = None
+        raise _Cancelled
+
+
+def _init_worker(path: str, name: str, shared, dedup):
+    # a forked worker has the level already, a spawned one loads it. a level run as a
+    # script is imported as __mp_main__ there, and is what __main__ refers to
+    global decided
+    _setup(sys.modules[name] if name in sys.modules else _load(path, name))
+    decided = shared
+    if dedup is not None:
+        _use_filter(*dedup)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, _interrupt)
+    signal.signal(signal.SIGINT, _quit)
+
+
+def _quit(signum, frame):
+    # ctrl-c reaches the whole process group, the main process reports it once
+    if saving is not None:
+        try:
+            saving()
+        except Exception:
+            pass
+    os._exit(1)
+
+
+def _new_filter() -> tuple:
+    import multiprocessing
+
+    return multiprocessing.RawArray("B", lvl.DEDUP), multiprocessing.RawArray("Q", 3), multiprocessing.Lock()
+
+
+def _use_filter(bits, stats, lock):
+    global seen, seen_stats, seen_lock, seen_flush
+    seen, seen_stats, seen_lock = memoryview(bits).cast("B"), stats, lock
+    seen_flush = max(1, min(DEDUP_FLUSH, int(DEDUP_LOAD * len(seen) * 8) // (2 * lvl.WORKERS)))
+
+
+def _bits(scope: str, candidate) -> list[int]:
+    # the filter's bits for a candidate of one race
+    digest = hashlib.blake2b(scope.encode() + pickle.dumps(candidate), digest_size=4 * DEDUP_HASHES).digest()
+    return [int.from_bytes(digest[i : i + 4]) % (len(seen) * 8) for i in range(0, len(digest), 4)]
+
+
+def _duplicate(bits: list[int]) -> bool:
+    return all(seen[bit >> 3] & 1 << (bit & 7) for bit in bits)
+
+
+def _reject(bits: list[int]):
+    for bit in bits:
+        seen[bit >> 3] |= 1 << (bit & 7)
+
+
+def _count_seen(checked: int, duplicates: int):
+    with seen_lock:
+        seen_stats[0] += checked
+        seen_stats[1] += duplicates
+        seen_stats[2] += checked - duplicates
+        if seen_stats[2] > DEDUP_LOAD * len(seen) * 8:
+            seen[:] = bytes(len(seen))
+            seen_stats[2] = 0
+
+
+def _candidates(inp, names):
+    # (strategy, candidate) from all given strategies, taking turns
+    gens = [(name, getattr(lvl, name)(*inp)) for name in names]
+    while gens:
+        for entry in list(gens):
+            try:
+                yield entry[0], next(entry[1])
+            except StopIteration:
+                gens.remove(entry)
+
+
+def _timed(candidates, telemetry: dict):
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(candidates)
+        except StopIteration:
+            return
+        telemetry["generate_s"] += time.perf_counter() - start
+        telemetry["generated"] += 1
+        yield item
+
+
+def _search(inp, seed, race=None, deadline=None, names=None):
+    # runs the strategies until a candidate validates, the race is decided elsewhere
+    # or the deadline passes. returns (candidate, seed, valid, score, strategy,
+    # telemetry), without a valid one that is the best candidate by the optional
+    # score hook. deadline is the file's, the part's clock starts here, so time
+    # spent waiting in the pool's queue does not count
+    global current_race, saving
+    if lvl.PART_DEADLINE is not None:
+        deadline = min(time.time() + lvl.PART_DEADLINE, deadline if deadline is not None else float("inf"))
+    key = _part_key(inp) if lvl.CHECKPOINT else None
+    # a part without a key cannot be found again, it starts over every time
+    checkpoint = lvl.CHECKPOINT if key is not None else None
+    state = _load_progress(key, seed) if checkpoint else None
+    if state is None:
+        random.seed(seed)
+        state = dict(best=None, best_score=None, telemetry=None)
+    else:
+        # the generators start over, but on the random stream where the saved search
+        # stopped, so the continuation is as reproducible as the original
+        random.setstate(state["rng"])
+    best, best_score, found = state["best"], state["best_score"], None
+    scoring = hasattr(lvl, "score")
+    candidates = _candidates(inp, names or strategies)
+    telemetry = None
+    if lvl.TELEMETRY:
+        telemetry = state["telemetry"]
+        if telemetry is None:
+            telemetry = dict(worker=None, seed=seed, generated=0, validated=0, accepted=0, duplicates=0)
+            telemetry |= dict(generate_s=0.0, validate_s=0.0)
+        telemetry["worker"] = os.getpid()
+        candidates = _timed(candidates, telemetry)
+
+    def save():
+        _save_progress(key, seed, dict(rng=random.getstate(), best=best, best_score=best_score, telemetry=telemetry))
+
+    current_race = race
+    saving = save if checkpoint else None
+    next_save = time.monotonic() + (checkpoint or 0)
+    scope = f"race {race}" if race is not None else f"search {next(searches)}"
+    checked = duplicates = 0
+    try:
+        for name, candidate in candidates:
+            if race is not None and decided[race % RACE_SLOTS] == race:
+                break
+            duplicate, bits = False, None
+            if seen is not None:
+                bits = _bits(scope, candidate)
+                duplicate = _duplicate(bits)
+                checked += 1
+                duplicates += duplicate
+                if checked == seen_flush:
+                    _count_seen(checked, duplicates)
+                    checked = duplicates = 0
+            if duplicate:
+                valid = False
+                if telemetry is not None:
+                    telemetry["duplicates"] += 1
+            elif telemetry is not None:
+                start = time.perf_counter()
+                valid = lvl.validate(candidate, *inp)
+                telemetry["validate_s"] += time.perf_counter() - start
+                telemetry["validated"] += 1
+                telemetry["accepted"] += bool(valid)
+            else:
+                valid = lvl.validate(candidate, *inp)
+            if valid:
+                found = candidate, seed, True, None, name
+                break
+            if bits is not None and not duplicate:
+                _reject(bits)
+            if scoring and not duplicate:
+                score = lvl.score(candidate, *inp)
+                if best_score is None or score > best_score:
+                    best, best_score = candidate, score
+            if deadline is not None and time.time() >= deadline:
+                break
+            if checkpoint and time.monotonic() >= next_save:
+                save()
+                next_save = time.monotonic() + checkpoint
+    except _Cancelled:
+        pass
+    except KeyboardInterrupt:
+        # only without a pool, workers save in _quit
+        if checkpoint:
+            save()
+        raise
+    finally:
+        current_race = None
+        saving = None
+        if checked:
+            _count_seen(checked, duplicates)
+    return (*(found or (best, seed, False, best_score, None)), telemetry)
+
+
+class _Memory:
+    # tracemalloc around one part. a sampler thread snapshots the allocations each
+    # time the traced size has grown well past the last snapshot, so the top sites
+    # are those near the peak and not just what outlives the part
+    def __enter__(self):
+        import tracemalloc
+
+        tracemalloc.start()
+        self.snapshot, self.size = None, 0
+        self.stop = threading.Event()
+        self.sampler = threading.Thread(target=self._sample, daemon=True)
+        self.sampler.start()
+        return self
+
+    def _sample(self):
+        import tracemalloc
+
+        while not self.stop.wait(MEMORY_SAMPLE_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > 1.25 * self.size:
+                self.snapshot, self.size = tracemalloc.take_snapshot(), current
+
+    def __exit__(self, *exc):
+        import tracemalloc
+
+        self.stop.set()
+        self.sampler.join()
+        current, peak = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.size:
+            self.snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        # without the sampler's own allocations
+        ignored = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, threading.__file__)]
+        stats = self.snapshot.filter_traces(ignored).statistics("lineno")
+        sites = [(f"{Path(stat.traceback[0].filename).name}:{stat.traceback[0].lineno}", stat.size) for stat in stats]
+        self.report = dict(peak=peak, sites=sites[:MEMORY_SITES])
+
+
+def _measured(fn, *args) -> tuple:
+    # the result tuple of fn with the memory report of the call appended, None without MEMORY
+    if not lvl.MEMORY:
+        return *fn(*args), None
+    with _Memory() as memory:
+        res = fn(*args)
+    return *res, memory.report
+
+
+def _available_memory() -> int | None:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _limit_concurrency(peak: int, write):
+    # a new largest part: if WORKERS of them at once would not fit, fewer run at a time
+    global concurrency
+    available = _available_memory()
+    if not isinstance(pool, futures.ProcessPoolExecutor) or available is None:
+        return
+    fits = max(1, int(MEMORY_HEADROOM * available // max(peak, 1)))
+    if fits < concurrency:
+        concurrency = fits
+        write(
+            f"⚠️ Parts peak at {peak / 2**20:.1f} MB, {lvl.WORKERS} workers would need {lvl.WORKERS * peak / 2**20:.0f} MB,"
+            f" more than {MEMORY_HEADROOM:.0%} of the {available / 2**20:.0f} MB available. running {concurrency} at a time"
+        )
+
+
+def _solve(inp, index, deadline=None):
+    # returns (result, seed, seconds, valid, telemetry of the searches)
+    start = time.perf_counter()
+    if not is_trial_and_error:
+        res = lvl.solve(*inp)
+        if not lvl.validate(res, *inp):
+            print(f"⚠️ Failed to validate part {index}")
+        return res, None, time.perf_counter() - start, True, None
+    res, seed, valid, _, name, telemetry = _search(inp, _seed(index, 0), deadline=deadline)
+    if valid:
+        _record_win(name, time.perf_counter() - start)
+    return res, seed, time.perf_counter() - start, valid, telemetry and [telemetry | dict(strategy=name)]
+
+
+def _solve_chunk(parts, tag=None):
+    if tag is not None:
+        return [_profiled(tag, _measured, _solve, inp, index) for inp, index in parts]
+    return [_measured(_solve, inp, index) for inp, index in parts]
+
+
+def _submit_chunk(parts, tag=None) -> futures.Future:
+    # parts: (inp, index, result future) solved by one pool task
+    chunk = pool.submit(_current, generation, _solve_chunk, [(inp, index) for inp, index, _ in parts], tag)
+
+    def finished(chunk):
+        with settling:
+            if chunk.exception() is not None:
+                for *_, result in parts:
+                    result.set_exception(chunk.exception())
+            else:
+                for (*_, result), res in zip(parts, chunk.result(), strict=True):
+                    result.set_result(res)
+
+    chunk.add_done_callback(finished)
+    return chunk
+
+
+def _search_published(published: tuple[str, int] | bytes, tag, *args):
+    from multiprocessing.shared_memory import SharedMemory
+
+    if isinstance(published, bytes):
+        inp = pickle.loads(published)
+    else:
+        shm = SharedMemory(name=published[0])
+        try:
+            inp = pickle.loads(shm.buf[: published[1]])
+        finally:
+            shm.close()
+    if tag is not None:
+        return _profiled(tag, _search, inp, *args)
+    return _search(inp, *args)
+
+
+def _race(inp, index, result: futures.Future, deadline=None, tag=None) -> list[futures.Future]:
+    from multiprocessing.shared_memory import SharedMemory
+
+    race = next(races)
+    start = time.perf_counter()
+    # the input is pickled once into shared memory, the workers only get its name
+    data = pickle.dumps(inp, protocol=pickle.HIGHEST_PROTOCOL)
+    if isinstance(pool, _Coordinator):
+        # workers on other machines cannot map it, they get the pickle itself
+        shm, published = None, data
+    else:
+        shm = SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        published = (shm.name, len(data))
+        shared_inputs[race] = shm
+    tasks_strategy = {
+        pool.submit(_current, generation, _measured, _search_published, published, tag, _seed(index, w), race, deadline, [name]): name
+        for w, name in enumerate(_allocate())
+    }
+    tasks = list(tasks_strategy)
+    remaining = len(tasks)
+    winner = None
+    best = []  # (score, candidate, seed) of workers that gave up without a valid candidate
+    # with telemetry on the part is only done once every worker has reported
+    telemetry = [] if lvl.TELEMETRY else None
+    reports = []  # memory of the workers that are done, the part gets the largest
+
+    def finished(task):
+        nonlocal remaining, winner
+        with settling:
+            remaining -= 1
+            if not remaining and shm is not None:
+                del shared_inputs[race]
+                shm.close()
+                shm.unlink()
+            if result.done():
+                return
+            if task.exception() is not None:
+                result.set_exception(task.exception())
+                return
+            candidate, seed, valid, score, name, searched, memory = task.result()
+            if memory is not None:
+                reports.append(memory)
+            memory = max(reports, key=operator.itemgetter("peak"), default=None)
+            if telemetry is not None:
+                telemetry.append(searched | dict(strategy=tasks_strategy[task]))
+            if valid and winner is None:
+                _decide(race)
+                _record_win(name, time.perf_counter() - start)
+                winner = (candidate, seed, time.perf_counter() - start, True)
+                stragglers.append((time.monotonic() + CANCEL_GRACE, tasks))
+            elif candidate is not None:
+                best.append((score, candidate, seed))
+            if winner is not None and (telemetry is None or not remaining):
+                result.set_result((*winner, telemetry, memory))
+            elif not remaining:
+                _, candidate, seed = max(best, key=operator.itemgetter(0), default=(None, None, None))
+                result.set_result((candidate, seed, time.perf_counter() - start, False, telemetry, memory))
+
+    for task in tasks:
+        task.add_done_callback(finished)
+    if deadline is not None:
+        with settling:
+            deadlines[race] = (deadline, tasks)
+    return tasks
+
+
+def _release_inputs():
+    # shared memory outlives the process, so the inputs of races an interrupted run
+    # left behind are unlinked once the pool is down
+    for shm in shared_inputs.values():
+        shm.close()
+        shm.unlink()
+    shared_inputs.clear()
+
+
+def _profiled(tag: str, fn, *args):
+    # each call dumps its own stats, _profile_reports merges them per input file
+    import cProfile
+
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(fn, *args)
+    finally:
+        profile.dump_stats(profiledir / f"{tag}.{os.getpid()}.{next(dumps)}.prof")
+
+
+def _collapse(stats: pstats.Stats) -> Counter:
+    # cProfile only knows caller -> callee edges, so stacks are rebuilt by walking
+    # down from the roots and splitting a function's time by how much of it each
+    # caller accounts for. good enough for a flame graph
+    def label(func):
+        file, line, name = func
+        return f"{Path(file).name}:{line}:{name}" if line else name
+
+    children = {}
+    for func, (*_, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+    stacks = Counter()
+
+    def walk(func, path, share):
+        _, _, tt, ct, _ = stats.stats[func]
+        path = path + [func]
+        stacks[";".join(map(label, path))] += tt * share
+        for child, edge_ct in children.get(func, []):
+            child_ct = stats.stats[child][3]
+            if child not in path and child_ct and len(path) < 128:
+                walk(child, path, share * edge_ct / child_ct)
+
+    for func, (*_, callers) in stats.stats.items():
+        if not callers and "_lsprof" not in func[2]:
+            walk(func, [], 1.0)
+    return stacks
+
+
+def _profile_reports():
+    import pstats
+
+    dumped = {}
+    for f in profiledir.glob("*.prof"):
+        dumped.setdefault(f.name.split(".")[0], []).append(f)
+    for tag, files in sorted(dumped.items()):
+        with open(profiledir / f"{tag}.txt", "w") as f:
+            stats = pstats.Stats(*map(str, files), stream=f)
+            stats.sort_stats("cumulative").print_stats(40)
+        with open(profiledir / f"{tag}.collapsed", "w") as f:
+            for stack, seconds in sorted(_collapse(stats).items()):
+                if round(seconds * 1e6):
+                    f.write(f"{stack} {round(seconds * 1e6)}\n")
+        for file in files:
+            file.unlink()
+        print(f"📊 {profiledir / tag}.txt")
+
+
+def _allocate() -> list[str]:
+    # one strategy per worker, proportional to past wins. every strategy counts one
+    # win more than it has, so none starves while there are enough workers
+    weights = {name: wins[name][0] + 1 for name in strategies}
+    if concurrency <= len(strategies):
+        return sorted(strategies, key=weights.get, reverse=True)[:concurrency]
+    share = (concurrency - len(strategies)) / sum(weights.values())
+    extra = {name: weights[name] * share for name in strategies}
+    workers = {name: 1 + int(extra[name]) for name in strategies}
+    for name in sorted(strategies, key=lambda name: extra[name] % 1, reverse=True)[: concurrency - sum(workers.values())]:
+        workers[name] += 1
+    return [name for name in strategies for _ in range(workers[name])]
+
+
+def _record_win(name: str, seconds: float):
+    wins[name][0] += 1
+    wins[name][1] += seconds
+
+
+def _decide(race: int):
+    decided[race % RACE_SLOTS] = race
+    if isinstance(pool, _Coordinator):
+        pool.broadcast(("decided", [race]))
+
+
+def _expire_races() -> float | None:
+    # a race past its file's deadline is decided without a winner, its workers hand
+    # in their best candidates. returns when the next deadline is due
+    now = time.time()
+    upcoming = None
+    with settling:
+        for race, (at, tasks) in list(deadlines.items()):
+            if all(task.done() for task in tasks):
+                del deadlines[race]
+            elif at <= now:
+                _decide(race)
+                stragglers.append((time.monotonic() + CANCEL_GRACE, tasks))
+                del deadlines[race]
+            else:
+                upcoming = at if upcoming is None else min(upcoming, at)
+    return upcoming
+
+
+def _interrupt_stragglers():
+    # losers stuck inside a long candidate get interrupted after a grace period
+    now = time.monotonic()
+    with settling:
+        for entry in list(stragglers):
+            at, tasks = entry
+            if all(task.done() for task in tasks):
+                stragglers.remove(entry)
+            elif at <= now and isinstance(pool, _Coordinator):
+                pool.broadcast(("interrupt",))
+            elif at <= now and hasattr(signal, "SIGUSR1"):
+                import multiprocessing
+
+                for p in multiprocessing.active_children():
+                    os.kill(p.pid, signal.SIGUSR1)
+
+
+def _address(address: str) -> tuple[str, int] | str:
+    # [host]:port for TCP, anything else is the path of a unix socket. without a host
+    # it is this machine only, serving other machines takes 0.0.0.0 on purpose
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "localhost", int(port)
+    return address
+
+
+class _Coordinator:
+    # stands in for the process pool: tasks go to worker processes that connect over
+    # a socket, here or on other machines, one task per worker at a time. a worker
+    # that goes away has its task queued again. connecting takes the level's
+    # fingerprint as key, so only workers running the same code get in. anyone with
+    # the source can compute it too, and tasks travel as pickles, so whoever reaches
+    # the port runs code on both ends. keep it to networks you trust
+    def __init__(self, address: str):
+        from multiprocessing.connection import Listener
+
+        self.listener = Listener(_address(address), authkey=fingerprint)
+        self.tasks = deque()  # (fn, args, future) no worker has taken yet
+        self.ready = threading.Condition()
+        self.workers = {}  # connection -> lock around its sends
+        self.closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+        contest = Path(lvl.__file__).parents[1].name
+        host, port = _address(address) if isinstance(_address(address), tuple) else (None, None)
+        if host == "0.0.0.0":
+            import socket
+
+            # the address other machines reach this one on
+            address = f"{socket.gethostname()}:{port}"
+        print(f"📡 Serving {level} on {address}, start workers with: python -m ccc {contest} {level} --worker {address}")
+        if host not in (None, "localhost", "127.0.0.1", "::1"):
+            print("⚠️ Whoever reaches this port can run code here, the key is no secret to anyone with the source")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, fn, *args) -> futures.Future:
+        future = futures.Future()
+        with self.ready:
+            self.tasks.append((fn, args, future))
+            self.ready.notify()
+        return future
+
+    def broadcast(self, msg: tuple):
+        for conn, lock in list(self.workers.items()):
+            try:
+                with lock:
+                    conn.send(msg)
+            except OSError:
+                pass
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify_all()
+        self.listener.close()
+        for conn in list(self.workers):
+            conn.close()
+
+    def _accept(self):
+        from multiprocessing.connection import AuthenticationError
+
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        lock = threading.Lock()
+        with lock:
+            self.workers[conn] = lock
+            # races decided before the worker joined
+            conn.send(("decided", [race for race in decided if race]))
+        task = None
+        try:
+            while True:
+                with self.ready:
+                    while not self.tasks and not self.closed:
+                        self.ready.wait()
+                    if self.closed:
+                        return
+                    task = self.tasks.popleft()
+                fn, args, future = task
+                with lock:
+                    conn.send(("task", fn, args))
+                kind, value = conn.recv()
+                task = None
+                if kind == "result":
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        except (OSError, EOFError):
+            if task is not None and not self.closed:
+                print("⚠️ Lost a worker, its task is queued again")
+                with self.ready:
+                    self.tasks.appendleft(task)
+                    self.ready.notify()
+        finally:
+            self.workers.pop(conn, None)
+            conn.close()
+
+
+def work(module: ModuleType, address: str):
+    # a worker for a coordinator started with main(module, serve=address), runs
+    # until the coordinator is done
+    import queue
+    import traceback
+    from multiprocessing.connection import Client
+
+    global decided
+    _setup(module)
+    decided = [0] * RACE_SLOTS
+    if lvl.DEDUP and is_trial_and_error:
+        _use_filter(*_new_filter())
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, _interrupt)
+    conn = Client(_address(address), authkey=fingerprint)
+    print(f"🔌 Working for {address}")
+    tasks = queue.SimpleQueue()
+
+    def listen():
+        # decisions and interrupts arrive while the main thread is busy with a task
+        try:
+            while True:
+                msg = conn.recv()
+                if msg[0] == "decided":
+                    for race in msg[1]:
+                        decided[race % RACE_SLOTS] = race
+                elif msg[0] == "interrupt" and hasattr(signal, "SIGUSR1"):
+                    os.kill(os.getpid(), signal.SIGUSR1)
+                elif msg[0] == "task":
+                    tasks.put(msg[1:])
+        except (OSError, EOFError):
+            tasks.put(None)
+
+    threading.Thread(target=listen, daemon=True).start()
+    done = 0
+    try:
+        while (task := tasks.get()) is not None:
+            fn, args = task
+            try:
+                reply = ("result", fn(*args))
+            except Exception as e:
+                reply = ("error", e)
+            try:
+                conn.send(reply)
+            except OSError:
+                break
+            except Exception as e:
+                # the result or exception does not pickle
+                conn.send(("error", RuntimeError(f"{traceback.format_exception(e)[-1].strip()} sending {reply[0]}")))
+            done += 1
+    except KeyboardInterrupt:
+        pass
+    print(f"🏁 {done} tasks done")
+    if seen is not None:
+        checked, duplicates, _ = seen_stats
+        print(f"🔁 {duplicates} of {checked} candidates were duplicates ({duplicates / max(checked, 1):.1%}) and skipped validate")
+
+
+def _part_key(inp) -> str | None:
+    # None for a part that does not pickle, a lambda in a defaultdict and the like.
+    # it is solved every time, in a pool it fails as it always has
+    try:
+        data = pickle.dumps(inp)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+    return hashlib.sha256(fingerprint + data).hexdigest()
+
+
+def _warn_once(msg: str):
+    if msg not in warned:
+        warned.add(msg)
+        print(msg)
+
+
+def _digest(res: str) -> str:
+    return hashlib.blake2b(res.encode(), digest_size=8).hexdigest()
+
+
+def _open_cache():
+    global cache
+    cache = sqlite3.connect(cachefile)
+    try:
+        _create_tables()
+    except sqlite3.DatabaseError as e:
+        if isinstance(e, sqlite3.OperationalError):
+            raise
+        # a damaged store is moved aside, everything in it can be solved again
+        cache.close()
+        cachefile.replace(cachefile.with_name(cachefile.name + ".corrupt"))
+        for suffix in ("-wal", "-shm"):
+            cachefile.with_name(cachefile.name + suffix).unlink(missing_ok=True)
+        print(f"⚠️ {cachefile.name} is damaged ({e}), moved it to {cachefile.name}.corrupt and starting afresh")
+        cache = sqlite3.connect(cachefile)
+        _create_tables()
+    for name, won, seconds in cache.execute("SELECT name, wins, seconds FROM strategies WHERE level = ?", (level,)):
+        if name in wins:
+            wins[name] = [won, seconds]
+
+
+def _create_tables():
+    # WAL keeps the store readable by other runs while this one writes. each commit
+    # is atomic, with NORMAL a crash may lose the last ones but never tears a row
+    cache.execute("PRAGMA journal_mode=WAL")
+    cache.execute("PRAGMA synchronous=NORMAL")
+    # results carry a digest, an entry that does not match it is solved again
+    cache.execute("CREATE TABLE IF NOT EXISTS parts (key TEXT PRIMARY KEY, result TEXT, seed TEXT, used REAL, digest TEXT)")
+    # how long a part took to solve, kept when its result is evicted
+    cache.execute("CREATE TABLE IF NOT EXISTS costs (key TEXT PRIMARY KEY, seconds REAL)")
+    # checkpoints of the run in progress, dropped once the level has been run to the end
+    cache.execute("CREATE TABLE IF NOT EXISTS finished (level TEXT, key TEXT, result TEXT, digest TEXT, PRIMARY KEY (level, key))")
+    cache.execute("CREATE TABLE IF NOT EXISTS progress (level TEXT, key TEXT, seed TEXT, state BLOB, PRIMARY KEY (key, seed))")
+    cache.execute(
+        "CREATE TABLE IF NOT EXISTS strategies (level TEXT, name TEXT, wins INTEGER, seconds REAL, PRIMARY KEY (level, name))"
+    )
+    for table in ("parts", "finished"):
+        if "digest" not in [row[1] for row in cache.execute(f"PRAGMA table_info({table})")]:
+            # stores from before the digests, their entries go unchecked
+            cache.execute(f"ALTER TABLE {table} ADD COLUMN digest TEXT")
+
+
+def _cache_lookup(keys: list[str]) -> dict[str, str]:
+    rows = cache.execute(
+        "UPDATE parts SET used = ? WHERE key IN (SELECT value FROM json_each(?)) RETURNING key, result, digest",
+        (time.time(), json.dumps(keys)),
+    ).fetchall()
+    intact = _intact("parts", rows)
+    cache.commit()
+    return intact | {key: res for key, res, *_ in pending}
+
+
+def _intact(table: str, rows: list[tuple[str, str, str | None]]) -> dict[str, str]:
+    # key -> result of the rows whose result matches its digest, the others are deleted
+    corrupt = [key for key, res, digest in rows if digest is not None and (res is None or digest != _digest(res))]
+    if corrupt:
+        cache.executemany(f"DELETE FROM {table} WHERE key = ?", [(key,) for key in corrupt])
+        print(f"⚠️ Dropped {len(corrupt)} corrupt entries from {cachefile.name}, solving them again")
+    return {key: res for key, res, _ in rows if key not in corrupt}
+
+
+def _cost_lookup(keys: list[str]) -> dict[str, float]:
+    rows = cache.execute("SELECT key, seconds FROM costs WHERE key IN (SELECT value FROM json_each(?))", (json.dumps(keys),))
+    return dict(rows.fetchall())
+
+
+def _cache_store(key: str, res: str, seed: str | None, seconds: float):
+    pending.append((key, res, seed, time.time(), seconds))
+    if len(pending) >= CACHE_BATCH or time.monotonic() - last_commit > CACHE_COMMIT_INTERVAL:
+        _cache_commit()
+
+
+def _checkpoint_store(key: str, res: str):
+    finished_rows.append((level, key, res, _digest(res)))
+    if len(finished_rows) >= CACHE_BATCH or time.monotonic() - last_commit > CACHE_COMMIT_INTERVAL:
+        _cache_commit()
+
+
+def _cache_commit():
+    global last_commit
+    cache.executemany(
+        "INSERT OR REPLACE INTO parts (key, result, seed, used, digest) VALUES (?, ?, ?, ?, ?)",
+        [(*row[:4], _digest(row[1])) for row in pending],
+    )
+    cache.executemany("INSERT OR REPLACE INTO costs VALUES (?, ?)", [(row[0], row[4]) for row in pending])
+    cache.executemany("INSERT OR REPLACE INTO finished (level, key, result, digest) VALUES (?, ?, ?, ?)", finished_rows)
+    cache.executemany("DELETE FROM progress WHERE key = ?", [(row[1],) for row in finished_rows])
+    cache.commit()
+    pending.clear()
+    finished_rows.clear()
+    last_commit = time.monotonic()
+
+
+def _resume():
+    rows = cache.execute("SELECT key, result, digest FROM finished WHERE level = ?", (level,)).fetchall()
+    resumed.update(_intact("finished", rows))
+    cache.commit()
+    searches = cache.execute("SELECT COUNT(*) FROM progress WHERE level = ?", (level,)).fetchone()[0]
+    if resumed or searches:
+        print(f"↩️ Resuming: {len(resumed)} parts done, {searches} searches to continue")
+
+
+def _clear_checkpoint():
+    # the level ran to the end, nothing left to resume
+    cache.execute("DELETE FROM finished WHERE level = ?", (level,))
+    cache.execute("DELETE FROM progress WHERE level = ?", (level,))
+    cache.commit()
+    resumed.clear()
+
+
+def _progress_db() -> sqlite3.Connection:
+    # a forked worker must not use the connection it inherited from the parent
+    global progress_db
+    if progress_db is None or progress_db[0] != os.getpid():
+        progress_db = (os.getpid(), sqlite3.connect(cachefile, timeout=30))
+    return progress_db[1]
+
+
+def _load_progress(key: str, seed: str) -> dict | None:
+    row = _progress_db().execute("SELECT state FROM progress WHERE key = ? AND seed = ?", (key, seed)).fetchone()
+    try:
+        return pickle.loads(row[0]) if row else None
+    except Exception:
+        # a damaged checkpoint only costs the search its head start
+        return None
+
+
+def _save_progress(key: str, seed: str, state: dict):
+    db = _progress_db()
+    db.execute("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)", (level, key, seed, pickle.dumps(state)))
+    db.commit()
+
+
+def _evict_cache():
+    evicted = cache.execute(
+        "DELETE FROM parts WHERE key IN (SELECT key FROM ("
+        "SELECT key, SUM(length(result) + ifnull(length(seed), 0)) OVER (ORDER BY used DESC) AS total FROM parts"
+        ") WHERE total > ?)",
+        (CACHE_LIMIT,),
+    ).rowcount
+    cache.commit()
+    if evicted:
+        cache.execute("VACUUM")
+
+
+def _parsed(infile: Path) -> list:
+    # parsed once per watch session, again only if the file, split_input or a
+    # class of the level changed
+    stamp = (infile.stat().st_mtime_ns, inspect.getsource(lvl.split_input), [cls for cls, _ in class_sources.values()])
+    if infile not in parsed or parsed[infile][0] != stamp:
+        with open(infile) as f:
+            parsed[infile] = (stamp, list(lvl.split_input(f.readlines())))
+    return parsed[infile][1]
+
+
+def _done(value) -> futures.Future:
+    task = futures.Future()
+    task.set_result(value)
+    return task
+
+
+def _size(inp) -> int:
+    # cheap stand-in for the cost of a part nobody has timed yet, e.g. the area of a grid
+    return sum(len(x) if hasattr(x, "__len__") else 1 for x in inp)
+
+
+def _estimate(inp) -> float:
+    seconds, size = observed
+    return _size(inp) * (seconds / size if size else 1e-6)
+
+
+def _parts(indices: list[int]) -> str:
+    return f"part {indices[0]}" if len(indices) == 1 else f"parts {', '.join(map(str, indices))}"
+
+
+class _Verifier:
+    # compares a file's parts with a reference output as they are written, a part
+    # of n lines against the next n lines of the reference
+    def __init__(self, reference: Path):
+        with open(reference) as f:
+            self.lines = iter(f.read().splitlines())
+        self.mismatches = []  # (index, expected lines, computed lines)
+        self.missing = 0  # reference lines no part got to
+
+    @property
+    def passed(self):
+        return not self.mismatches and not self.missing
+
+    def check(self, index, res: str) -> bool:
+        got = res.split("\n")
+        want = list(islice(self.lines, len(got)))
+        if want != got:
+            self.mismatches.append((index, want, got))
+        return want == got
+
+    def finish(self):
+        self.missing = sum(1 for _ in self.lines)
+
+    def report(self, write=print):
+        if self.mismatches:
+            write(f"   {_parts([index for index, *_ in self.mismatches])} did not match")
+        for index, want, got in self.mismatches[:REPORTED_PARTS]:
+            diff = list(difflib.unified_diff(want, got, "expected", "computed", lineterm="", n=1))[2:]
+            write(f"   part {index}:")
+            for line in diff[:DIFF_LINES]:
+                write(f"     {line}")
+        if self.missing:
+            write(f"   {self.missing} more lines expected")
+
+
+class _Job:
+    # one input file: parts are parsed and looked up one window at a time and at
+    # most about STREAM_WINDOW of them are in flight. the expensive ones are
+    # dispatched first, results are written in input order as soon as the head
+    # of the window is done
+    def __init__(
+        self,
+        infile: Path,
+        outfile: Path,
+        verifier: _Verifier | None = None,
+        solving: dict | None = None,
+        progress: _Progress | None = None,
+    ):
+        if watching:
+            parts = _parsed(leveldir / infile)
+        else:
+            with open(leveldir / infile) as f:
+                parts = lvl.split_input(f.readlines())
+        self.infile, self.outfile, self.verifier = infile, outfile, verifier
+        self.parts = batched(enumerate(parts), STREAM_WINDOW)
+        self.queue = []  # (estimated seconds, index, inp, result) not dispatched yet, cheapest first
+        self.inflight = deque()  # (key, index, size if solved here else None, result) in input order
+        # key -> result, shared by the jobs of a run so duplicate parts are solved once
+        self.solving = {} if solving is None else solving
+        self.progress = progress
+        self.exhausted = False
+        self.out = None
+        self.telemetry = None
+        self.memory_log = None
+        self.peak = None  # (index, memory report) of the part with the largest peak
+        self.started = time.time()
+
+    @property
+    def finished(self):
+        return self.exhausted and not self.queue and not self.inflight
+
+    def peek(self) -> float | None:
+        # estimated cost of the next part to dispatch, None if there is none right now
+        if not self.queue and not self.exhausted and len(self.inflight) < STREAM_WINDOW:
+            self._next_batch()
+        return self.queue[-1][0] if self.queue else None
+
+    def _next_batch(self):
+        batch = next(self.parts, None)
+        if batch is None:
+            self.exhausted = True
+            return
+        # None for parts that do not pickle, they are neither cached nor shared
+        keys = [_part_key(inp) for _, inp in batch]
+        if None in keys and (lvl.CACHING or lvl.CHECKPOINT or watching):
+            _warn_once(f"⚠️ Parts of {self.infile.name} do not pickle, they are solved again every run")
+        cached = _cache_lookup(keys) if lvl.CACHING and not lvl.RECOMPUTE else {}
+        if watching:
+            # solved in this session, so good whatever RECOMPUTE says
+            cached |= {key: solved[key] for key in keys if key in solved}
+        # finished by the interrupted run, also good whatever RECOMPUTE says
+        cached |= {key: resumed[key] for key in keys if key in resumed}
+        costs = _cost_lookup(keys) if lvl.CACHING else {}
+        for (index, inp), key in zip(batch, keys, strict=True):
+            if key in cached:
+                self._track(key, index, None, _done((cached[key], None, None, True, None, None)))
+            elif key in self.solving:
+                self._track(key, index, None, self.solving[key])
+            else:
+                result = futures.Future()
+                if key is not None:
+                    self.solving[key] = result
+                self._track(key, index, _size(inp), result)
+                self.queue.append((costs[key] if key in costs else _estimate(inp), index, inp, result))
+        if pool is None:
+            self.queue.reverse()
+        else:
+            # longest job first
+            self.queue.sort(key=operator.itemgetter(0))
+
+    def _track(self, key, index, size, result: futures.Future):
+        self.inflight.append((key, index, size, result))
+        if self.progress is not None:
+            # counted when done, the output waits for the parts before it
+            result.add_done_callback(self.progress.count)
+
+    def _deadline(self) -> float | None:
+        # the file's, _search adds PART_DEADLINE once the part has started
+        return self.started + lvl.FILE_DEADLINE if lvl.FILE_DEADLINE is not None else None
+
+    def dispatch(self, running: list[futures.Future]):
+        estimate, index, inp, result = self.queue.pop()
+        tag = self.infile.stem if lvl.PROFILE else None
+        if pool is None and tag is not None:
+            result.set_result(_profiled(tag, _measured, _solve, inp, index, self._deadline()))
+        elif pool is None:
+            result.set_result(_measured(_solve, inp, index, self._deadline()))
+        elif is_trial_and_error:
+            running.extend(_race(inp, index, result, self._deadline(), tag))
+        else:
+            # cheap parts travel together until the chunk is worth a round trip, but
+            # no chunk takes more than its share of the queue. until parts have been
+            # timed every part travels on its own
+            limit = max(1, (len(self.queue) + 1) // concurrency) if observed[1] else 1
+            chunk = [(inp, index, result)]
+            while self.queue and estimate < CHUNK_SECONDS and len(chunk) < limit:
+                more, index, inp, result = self.queue.pop()
+                estimate += more
+                chunk.append((inp, index, result))
+            running.append(_submit_chunk(chunk, tag))
+
+    def _write_telemetry(self, index, seconds, workers: list[dict]):
+        if self.telemetry is None:
+            self.telemetry = open(leveldir / self.infile.with_suffix(".telemetry.jsonl").name, "w", buffering=1)
+        keys = ("generated", "validated", "accepted", "duplicates", "generate_s", "validate_s")
+        total = {k: sum(w[k] for w in workers) for k in keys}
+        total["acceptance"] = total["accepted"] / total["validated"] if total["validated"] else None
+        self.telemetry.write(json.dumps(dict(part=index, seconds=seconds, **total, workers=workers)) + "\n")
+
+    def _write_memory(self, index, memory: dict, progress: _Progress):
+        if self.memory_log is None:
+            self.memory_log = open(leveldir / self.infile.with_suffix(".memory.jsonl").name, "w", buffering=1)
+        self.memory_log.write(json.dumps(dict(part=index, peak_kb=memory["peak"] // 1024, sites=memory["sites"])) + "\n")
+        if self.peak is None or memory["peak"] > self.peak[1]["peak"]:
+            self.peak = (index, memory)
+            _limit_concurrency(memory["peak"], progress.write)
+
+    def flush(self, progress: _Progress):
+        while self.inflight and self.inflight[0][3].done():
+            key, index, size, result = self.inflight.popleft()
+            res, seed, seconds, valid, telemetry, memory = result.result()
+            if telemetry and size is not None:
+                self._write_telemetry(index, seconds, telemetry)
+            if memory is not None:
+                self._write_memory(index, memory, progress)
+            if not valid:
+                found = "best candidate so far" if res is not None else "no candidate"
+                progress.write(f"⏱️ {self.infile.name} part {index}: deadline hit, {found}")
+                res = res if res is not None else ""
+            if size is not None:
+                observed[0] += seconds
+                observed[1] += size
+            if size is not None and key is not None:
+                del self.solving[key]
+                if lvl.CACHING and valid:
+                    # random.seed(seed) before solve() replays the winning run
+                    _cache_store(key, res, seed, seconds)
+                if watching and valid:
+                    solved[key] = res
+                if lvl.CHECKPOINT and valid:
+                    # a deadline result is no answer, a resumed run gets to search again
+                    _checkpoint_store(key, res)
+            if self.out is None:
+                # the file gets its name once complete, until then the finished prefix is in .partial
+                self.out = open(self.partial, "w")
+            self.out.write(res + "\n")
+            if self.verifier is not None and not self.verifier.check(index, res) and lvl.FAIL_FAST:
+                # parts still on the workers finish, nobody waits for them
+                self.queue.clear()
+                self.inflight.clear()
+                self.exhausted = True
+        if self.out is not None:
+            # one write for all parts this call finished
+            self.out.flush()
+        if self.finished:
+            if self.verifier is not None and not self.verifier.mismatches:
+                self.verifier.finish()
+            if self.peak is not None:
+                index, memory = self.peak
+                site, size = memory["sites"][0] if memory["sites"] else ("?", 0)
+                progress.write(
+                    f"🧠 {self.infile.name}: peak {memory['peak'] / 2**20:.1f} MB in part {index},"
+                    f" most of it from {site} ({size / 2**20:.1f} MB)"
+                )
+            self.close(complete=True)
+
+    @property
+    def partial(self) -> Path:
+        return leveldir / f"{self.outfile.name}.partial"
+
+    def close(self, complete=False):
+        # an interrupted file stays .partial, so no truncated output ever has the real name
+        if complete and self.out is not None:
+            os.fsync(self.out.fileno())
+        for f in (self.out, self.telemetry, self.memory_log):
+            if f is not None:
+                f.close()
+        if complete and self.out is not None:
+            os.replace(self.partial, leveldir / self.outfile)
+
+
+class _Progress:
+    # a tqdm bar once the run takes longer than PROGRESS_INTERVAL, a run served
+    # from the cache is over before tqdm would even be imported
+    def __init__(self):
+        self.refreshed = time.monotonic()
+        self.done = 0  # parts with a result, in whatever order they finish
+        self.bar = None
+
+    def count(self, result: futures.Future):
+        # done callback of the parts, may run on the executor's threads
+        with settling:
+            self.done += 1
+
+    def write(self, msg: str):
+        if self.bar is not None:
+            self.bar.write(msg)
+        else:
+            print(msg)
+
+    def refresh(self):
+        # cheap enough to call after every part, redraws every PROGRESS_INTERVAL
+        if time.monotonic() - self.refreshed < PROGRESS_INTERVAL:
+            return
+        self.refreshed = time.monotonic()
+        if self.bar is None:
+            from tqdm import tqdm
+
+            self.bar = tqdm(file=sys.stdout, mininterval=PROGRESS_INTERVAL, initial=self.done)
+        self.bar.n = self.done
+        self.bar.refresh()
+
+    def close(self):
+        if self.bar is not None:
+            self.bar.n = self.done
+            self.bar.close()
+
+
+def _run_files(files: list[tuple[Path, Path] | tuple[Path, Path, _Verifier]]):
+    # all parts of all files share one queue and the most expensive part is
+    # dispatched first, a file's slow tail leaves the free workers to the others
+    solving = {}
+    # redrawn at most every PROGRESS_INTERVAL however many parts finish, and at least
+    # that often while waiting on slow ones or solving without a pool
+    progress = _Progress()
+    jobs = [_Job(*file, solving=solving, progress=progress) for file in files]
+    running = []  # pool tasks that are queued or occupy a worker
+    try:
+        while jobs:
+            running = [task for task in running if not task.done()]
+            # a queue of another round of tasks keeps the workers busy, unless memory is short
+            while len(running) < (2 * concurrency if concurrency == lvl.WORKERS else concurrency):
+                ready = [(estimate, job) for job in jobs if (estimate := job.peek()) is not None]
+                if not ready:
+                    break
+                job = max(ready, key=operator.itemgetter(0))[1] if pool is not None else ready[0][1]
+                job.dispatch(running)
+                job.flush(progress)
+                progress.refresh()
+            for job in jobs:
+                job.flush(progress)
+                if job.finished:
+                    progress.write(f"{job.infile.name}")
+            jobs = [job for job in jobs if not job.finished]
+            upcoming = _expire_races()
+            _interrupt_stragglers()
+            waiting = running + [result for job in jobs for *_, result in job.inflight]
+            if jobs and waiting:
+                timeout = CANCEL_GRACE if stragglers else PROGRESS_INTERVAL
+                if upcoming is not None:
+                    timeout = max(0, min(timeout, upcoming - time.time()))
+                futures.wait(waiting, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+            progress.refresh()
+    finally:
+        progress.close()
+        for job in jobs:
+            job.close()
+        _sync(leveldir)
+        if lvl.CACHING or lvl.CHECKPOINT:
+            _cache_commit()
+
+
+def _sync(directory: Path):
+    # makes the renames of a whole batch of files durable at once
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _run_all():
+    # outputs of the last run stay until a complete one replaces them
+    example_in_file = leveldir / (level + "_example.in")
+    reference = example_in_file.with_suffix(".out")
+    if not example_in_file.exists():
+        print("⚠️ No example file found")
+    elif not reference.exists():
+        print("⚠️ No example output to check against")
+        _run_files([(example_in_file, example_in_file.with_suffix(".out.computed"))])
+    else:
+        verifier = _Verifier(reference)
+        _run_files([(example_in_file, example_in_file.with_suffix(".out.computed"), verifier)])
+        if verifier.passed:
+            print("✅ Example check passed")
+        else:
+            print("⚠️ Example check failed")
+            verifier.report()
+            if lvl.FAIL_FAST:
+                return
+
+    files = [file for file in leveldir.iterdir() if re.match(r"level\d+_\d+\.in", file.name)]
+    _run_files([(file, file.with_suffix(".out")) for file in files])
+    if lvl.CHECKPOINT:
+        _clear_checkpoint()
+
+
+def _watch():
+    # runs the level again whenever its file is saved, until interrupted
+    import traceback
+
+    global watching, class_sources
+    watching = True
+    class_sources = _classes(lvl)
+    mtime = os.stat(lvl.__file__).st_mtime_ns
+    loaded = True
+    try:
+        while True:
+            if loaded:
+                try:
+                    _run_all()
+                except Exception:
+                    traceback.print_exc()
+            print(f"👀 Waiting for changes to {level}.py")
+            while os.stat(lvl.__file__).st_mtime_ns == mtime:
+                time.sleep(WATCH_INTERVAL)
+            mtime = os.stat(lvl.__file__).st_mtime_ns
+            try:
+                _reload()
+                loaded = True
+            except Exception:
+                traceback.print_exc()
+                loaded = False
+    except KeyboardInterrupt:
+        pass
+
+
+def _output_parts(lines: list[str], parts: int) -> list[str] | None:
+    # one line per part, unless the level knows better with a split_output(lines) hook
+    if hasattr(lvl, "split_output"):
+        return list(lvl.split_output(lines))
+    return lines if len(lines) == parts else None
+
+
+def _validate_chunk(chunk: list[tuple[int, tuple, str]]) -> list[int]:
+    # indices of the parts that do not validate
+    return [index for index, inp, res in chunk if not lvl.validate(res, *inp)]
+
+
+def check(module: ModuleType):
+    # runs validate over the .out files there are, in parallel, without solving anything
+    _setup(module)
+    files = [f for f in leveldir.iterdir() if re.fullmatch(r"level\d+_(\d+|example)\.in", f.name) and f.with_suffix(".out").exists()]
+    executor = None
+    if lvl.WORKERS > 1:
+        initargs = (lvl.__file__, lvl.__name__, None, None)
+        executor = futures.ProcessPoolExecutor(lvl.WORKERS, initializer=_init_worker, initargs=initargs)
+    failed = False
+    try:
+        for infile in sorted(files, key=lambda f: (not f.stem.endswith("example"), len(f.name), f.name)):
+            with open(infile) as f:
+                parts = list(lvl.split_input(f.readlines()))
+            with open(infile.with_suffix(".out")) as f:
+                results = _output_parts(f.read().splitlines(), len(parts))
+            if results is None or len(results) != len(parts):
+                print(f"⚠️ {infile.with_suffix('.out').name}: cannot split it into {len(parts)} parts, add a split_output hook")
+                failed = True
+                continue
+            items = [(index, inp, res) for index, (inp, res) in enumerate(zip(parts, results, strict=True))]
+            size = max(1, len(items) // (4 * lvl.WORKERS))
+            if executor is None:
+                tasks = [_done(_validate_chunk(chunk)) for chunk in batched(items, size)]
+            else:
+                tasks = [executor.submit(_validate_chunk, chunk) for chunk in batched(items, size)]
+            invalid = []
+            for task in futures.as_completed(tasks):
+                invalid += task.result()
+                if invalid and lvl.FAIL_FAST:
+                    for other in tasks:
+                        other.cancel()
+                    break
+            if not invalid:
+                print(f"✅ {infile.with_suffix('.out').name}: {len(parts)} parts valid")
+                continue
+            failed = True
+            invalid.sort()
+            print(f"⚠️ {infile.with_suffix('.out').name}: {_parts(invalid)} failed validation")
+            for index in invalid[:REPORTED_PARTS]:
+                print(f"   part {index}: {results[index][:80]}")
+            if lvl.FAIL_FAST:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if failed:
+        sys.exit(1)
+
+
+def main(module: ModuleType, watch: bool = False, serve: str | None = None):
+    global pool, decided, concurrency
+    _setup(module)
+    concurrency = lvl.WORKERS
+    run = _watch if watch else _run_all
+
+    if lvl.CACHING or lvl.CHECKPOINT:
+        _open_cache()
+    if lvl.CHECKPOINT:
+        _resume()
+    # a coordinator's workers keep filters of their own
+    dedup = _new_filter() if lvl.DEDUP and is_trial_and_error and serve is None else None
+    if dedup is not None:
+        _use_filter(*dedup)
+    if lvl.PROFILE:
+        profiledir.mkdir(exist_ok=True)
+        for f in profiledir.iterdir():
+            f.unlink()
+
+    if serve is not None:
+        # WORKERS tasks per race and twice that in flight, as with a local pool
+        decided = [0] * RACE_SLOTS
+        with _Coordinator(serve) as pool:
+            try:
+                run()
+            finally:
+                pool = None
+    elif lvl.WORKERS == 1:
+        run()
+    else:
+        # one pool for every part of every file
+        import multiprocessing
+
+        decided = multiprocessing.RawArray("Q", RACE_SLOTS)
+        initargs = (lvl.__file__, lvl.__name__, decided, dedup)
+        try:
+            with futures.ProcessPoolExecutor(lvl.WORKERS, initializer=_init_worker, initargs=initargs) as pool:
+                try:
+                    run()
+                finally:
+                    pool = None
+        finally:
+            _release_inputs()
+
+    if lvl.PROFILE:
+        # after the pool is shut down, so stragglers have dumped their stats too
+        _profile_reports()
+
+    if len(strategies) > 1:
+        print("🏁 " + ", ".join(f"{name}: {won} wins, {s / max(won, 1):.2f}s avg" for name, (won, s) in wins.items() if name in strategies))
+
+    if dedup is not None:
+        checked, duplicates, _ = seen_stats
+        print(f"🔁 {duplicates} of {checked} candidates were duplicates ({duplicates / max(checked, 1):.1%}) and skipped validate")
+
+    if lvl.CACHING:
+        cache.executemany("INSERT OR REPLACE INTO strategies VALUES (?, ?, ?, ?)", [(level, n, *w) for n, w in wins.items()])
+        cache.commit()
+        _evict_cache()
+    if lvl.CACHING or lvl.CHECKPOINT:
+        cache.close()